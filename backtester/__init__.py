@@ -3,3 +3,15 @@ from .reference import *
 from .backtester import *
 from .strategy import *
 from .utils import *
+from .vector import *
+from .sweep import *
+from .walkforward import *
+from .barstore import *
+from .resample import *
+from .drawdown import *
+from .metrics import *
+from .panel import *
+from .portfolio import *
+from .order import *
+from .indicators import *
+from .profiler import *
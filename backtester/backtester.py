@@ -1,14 +1,46 @@
 from __future__ import (absolute_import, division, print_function, unicode_literals)
+from typing import Iterable, Iterator, Union
+import os
+import pickle
+import time
+import numpy as np
 import pandas as pd
+from pandas.api.types import is_datetime64_ns_dtype
 from .config import *
 from .store import *
 from .broker import *
+from .shared import *
+from .reference import *
+from .metrics import *
+from .report import *
+from .profiler import *
+from . import utils
+
+_DAILY_AGGREGATIONS = {
+	"open": "first",
+	"high": "max",
+	"low": "min",
+	"close": "last"
+}
+
+def _get_daily_bars(data: pd.DataFrame) -> pd.DataFrame:
+	columns = [x for x in ["open", "high", "low", "close"] if x in data.columns]
+
+	if len(columns) == 0:
+		return data[["datetime"]].iloc[[0, -1]]
+
+	bars = data.set_index("datetime")[columns].resample("D").agg({x: _DAILY_AGGREGATIONS[x] for x in columns})
+	return bars.dropna(how="all").reset_index()
 
 class Backtester:
 	def __init__(self):
 		self.__cfg = Config()
 		self.__store = Store()
 		self.__broker = Broker()
+		self.__chunks = None
+		self.__daily = False
+		self.__profiler = None
+		self.__profiled = []
 
 	@property
 	def cfg(self) -> Config:
@@ -31,12 +63,21 @@ class Backtester:
 	def set_funding_rate(self, percent: float):
 		self.__cfg.funding_rate = percent / 100
 
+	def set_funding_rates(self, rates: dict):
+		self.__cfg.funding_rates = {symbol: percent / 100 for symbol, percent in rates.items()}
+
 	def set_funding_rate_hours(self, hours: list[int]):
 		self.__cfg.funding_rate_hours = hours
 
 	def set_leverage(self, leverage: int):
 		self.__cfg.leverage = leverage
 
+	def set_liquidation(self, enabled: bool = True):
+		self.__cfg.liquidation = enabled
+
+	def set_liquidation_fee_rate(self, percent: float):
+		self.__cfg.liquidation_fee_rate = percent / 100
+
 	def set_base_precision(self, precision: int):
 		self.__cfg.base_precision = precision
 
@@ -46,5 +87,241 @@ class Backtester:
 	def set_price_precision(self, precision: int):
 		self.__cfg.price_precision = precision
 
-	def set_data(self, data: pd.DataFrame):
-		self.__store.data = data.reset_index()
+	def set_equity_curve(self, enabled: bool = True):
+		self.__cfg.equity_curve = enabled
+
+	def set_equity_curve_timeframe(self, timeframe: Union[str, None]):
+		if timeframe is not None and timeframe not in TIMEFRAMES:
+			raise Exception(f"Unknown timeframe '{timeframe}'")
+
+		self.__cfg.equity_curve_timeframe = timeframe
+
+	def set_metrics_only(self, enabled: bool = True):
+		self.__cfg.metrics_only = enabled
+
+	def set_feature_cache(self, path: Union[str, None], max_bytes: Union[int, None] = None):
+		self.__cfg.feature_cache_path = path
+		self.__cfg.feature_cache_max_bytes = max_bytes
+
+	def set_profiling(self, enabled: bool = True):
+		self.__cfg.profiling = enabled
+
+	def set_checkpoint(self, path: Union[str, None], every: int = 100000):
+		if every <= 0:
+			raise Exception("Checkpoint interval must be greater zero")
+
+		self.__cfg.checkpoint_path = path
+		self.__cfg.checkpoint_bars = every
+
+	def set_data(self, data: Union[pd.DataFrame, SharedData, Iterable[pd.DataFrame]]):
+		self.__chunks = None
+		self.__daily = False
+
+		if isinstance(data, SharedData):
+			self.__store.data = data.data
+		elif isinstance(data, pd.DataFrame):
+			self.__store.data = data.reset_index()
+		else:
+			# Chunked feeds are only read by run(), one frame at a time.
+			self.__store.data = None
+			self.__chunks = data
+
+	def _has_chunks(self) -> bool:
+		return self.__chunks is not None
+
+	def _get_chunks(self) -> Iterator[pd.DataFrame]:
+		if self.__chunks is None:
+			yield self.__store.data
+			return
+
+		start_datetime = None
+		end_datetime = None
+		daily = []
+
+		for chunk in self.__chunks:
+			if len(chunk.index) == 0:
+				continue
+
+			chunk = chunk if "datetime" in chunk.columns else chunk.reset_index()
+
+			if end_datetime is not None and chunk["datetime"].iloc[0] <= end_datetime:
+				raise Exception("Data chunks must be in chronological order")
+
+			self.__store.data = chunk
+			start_datetime = start_datetime if start_datetime is not None else chunk["datetime"].iloc[0]
+			end_datetime = chunk["datetime"].iloc[-1]
+			daily.append(_get_daily_bars(chunk))
+			yield chunk
+
+		if start_datetime is None:
+			raise Exception("Data feed is empty")
+
+		# Only the daily bars of a streamed feed are kept for the report's benchmark.
+		self.__store.data = pd.concat(daily, ignore_index=True)
+		self.__store._set_span(start_datetime, end_datetime)
+
+	def _check_data(self):
+		if self.__store.data is None or len(self.__store.data) == 0:
+			raise Exception("Data feed is empty")
+
+		if self.__broker.cash == 0:
+			raise Exception("Insufficient funds")
+
+		if not "datetime" in self.__store.data.columns or not is_datetime64_ns_dtype(self.__store.data["datetime"]):
+			raise Exception("Data feed must have column 'datetime' as Pandas Timestamp")
+
+	def _append_data(self, data: pd.DataFrame) -> pd.DataFrame:
+		data = data if "datetime" in data.columns else data.reset_index()
+
+		if len(data.index) == 0:
+			return data
+
+		start_datetime, end_datetime = self.__store.start_datetime, self.__store.end_datetime
+
+		if end_datetime is None:
+			raise Exception("Data feed is empty")
+
+		if data["datetime"].iloc[0] <= end_datetime:
+			raise Exception("Appended bars must come after the last bar of the backtest")
+
+		# Like a streamed feed, only daily bars are kept for the report, so an append only adds the new days.
+		if self.__chunks is None and not self.__daily:
+			self.__store.data = _get_daily_bars(self.__store.data)
+			self.__daily = True
+
+		self.__store.data = pd.concat([self.__store.data, _get_daily_bars(data)], ignore_index=True)
+
+		self.__store._set_span(start_datetime, data["datetime"].iloc[-1])
+		return data
+
+	def _save_checkpoint(self, cursor: dict, exclude: list[str]):
+		excluded = set(exclude + self.__profiled + ["_Backtester__chunks", "_Backtester__profiler", "_Backtester__profiled"])
+		state = {k: v for k, v in self.__dict__.items() if k not in excluded}
+		path = self.__cfg.checkpoint_path
+		tmp_path = f"{path}.{os.getpid()}.tmp"
+
+		# The previous checkpoint is only replaced once the new one is complete on disk.
+		with open(tmp_path, "wb") as f:
+			pickle.dump({"cursor": cursor, "state": state}, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+		os.replace(tmp_path, path)
+
+	def _load_checkpoint(self) -> Union[dict, None]:
+		path = self.__cfg.checkpoint_path
+
+		if path is None:
+			raise Exception("Checkpoint path isn't set")
+
+		if not os.path.exists(path):
+			return None
+
+		with open(path, "rb") as f:
+			checkpoint = pickle.load(f)
+
+		data = self.__store.data
+		self.__dict__.update(checkpoint["state"])
+		self.__store.data = data
+		return checkpoint["cursor"]
+
+	def _start_metrics(self):
+		# In metrics only mode journal entries are folded into running statistics instead of being kept.
+		if self.__cfg.metrics_only:
+			self.__store._set_metrics(Metrics(self.__broker.cash, self.__store.start_datetime, self.__cfg))
+		else:
+			self.__store._set_metrics(None)
+
+	def __get_journals(self) -> dict:
+		return {
+			"portfolio_history": self.__store.portfolio_history,
+			"equity_curve": self.__store.equity_curve,
+			"transactions": self.__store.transactions,
+			"trades": self.__store.trades
+		}
+
+	def _start_profile(self, sections: dict):
+		self.__profiler = None
+
+		# Leftover wrappers of a run that raised are dropped before wrapping again.
+		for attr in self.__profiled:
+			self.__dict__.pop(attr, None)
+
+		self.__profiled = []
+
+		if not self.__cfg.profiling:
+			return
+
+		# Sections are timed by shadowing the methods on the instance, so a run without profiling executes no extra code.
+		self.__profiler = Profiler()
+
+		for name, attr in sections.items():
+			setattr(self, attr, self.__profiler.wrap(name, getattr(self, attr)))
+			self.__profiled.append(attr)
+
+		self.__profiler._start(self.__get_journals())
+
+	def _get_report(self, bars: int = 0) -> Union[Report, MetricsReport]:
+		profiler = self.__profiler
+
+		if profiler is None:
+			return self.__create_report()
+
+		for attr in self.__profiled:
+			self.__dict__.pop(attr, None)
+
+		self.__profiled = []
+		self.__profiler = None
+		profiler._stop(self.__get_journals(), bars)
+		start = time.perf_counter()
+		report = self.__create_report()
+		profiler._add("report", time.perf_counter() - start)
+		report._set_profile(profiler)
+		return report
+
+	def __create_report(self) -> Union[Report, MetricsReport]:
+		if self.__store.metrics is not None:
+			return MetricsReport(
+				strategy=self.__class__.__name__,
+				broker=self.__broker,
+				cfg=self.__cfg,
+				metrics=self.__store.metrics,
+				start_datetime=self.__store.start_datetime,
+				end_datetime=self.__store.end_datetime
+			)
+
+		return Report(
+			strategy=self.__class__.__name__,
+			broker=self.__broker,
+			cfg=self.__cfg,
+			store=self.__store,
+		)
+
+	def _get_funding_mask(self, datetimes: pd.DatetimeIndex) -> np.ndarray:
+		return utils.get_first_min_of_timeframe_mask(datetimes, "1h") & np.isin(datetimes.hour, self.__cfg.funding_rate_hours)
+
+	def _get_snapshot_mask(self, datetimes: pd.DatetimeIndex) -> np.ndarray:
+		return utils.get_first_min_of_timeframe_mask(datetimes, "1D")
+
+	def _get_equity_curve(self, datetimes: pd.arrays.DatetimeArray, equity: np.ndarray) -> dict:
+		timeframe = self.__cfg.equity_curve_timeframe
+
+		if timeframe is None or len(equity) == 0:
+			return {"datetime": datetimes, "amount": equity, "high": equity, "low": equity}
+
+		# Each candle keeps its closing, highest and lowest equity, so drawdown peaks and troughs survive downsampling.
+		keys = utils.get_candle_open_timestamps(pd.DatetimeIndex(datetimes), timeframe)
+		values = keys.asi8
+		starts = np.flatnonzero(np.r_[True, values[1:] != values[:-1]])
+		ends = np.r_[starts[1:], len(values)]
+		return {"datetime": keys[starts], "amount": equity[ends - 1], "high": np.fmax.reduceat(equity, starts), "low": np.fmin.reduceat(equity, starts)}
+
+	def _extend_equity_curve(self, datetimes: pd.DatetimeIndex, equity: np.ndarray, final: bool = True) -> tuple[pd.DatetimeIndex, np.ndarray]:
+		i = len(equity)
+
+		# The last candle may go on in the next chunk, so its bars are held back and returned to the caller.
+		if not final and self.__cfg.equity_curve_timeframe is not None and len(equity) > 0:
+			keys = utils.get_candle_open_timestamps(datetimes, self.__cfg.equity_curve_timeframe).asi8
+			i = int(np.searchsorted(keys, keys[-1], side="left"))
+
+		# Max drawdown is taken from every bar before the candles are reduced, so it doesn't depend on the timeframe.
+		self.__store._extend_equity_curve(self._get_equity_curve(datetimes[:i].array, equity[:i]), np.round(equity[:i], self.__cfg.quote_precision))
+		return datetimes[i:], equity[i:]
@@ -0,0 +1,96 @@
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+from collections.abc import Mapping
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_datetime64_any_dtype
+from . import utils
+
+class Bar(Mapping):
+	def __init__(self, data: pd.DataFrame):
+		self.__columns = {}
+		self.__timestamps = {}
+		self.__boxed = {}
+		self.__masks = {}
+		self.__index = -1
+		self.__length = len(data.index)
+
+		for column in data.columns:
+			if is_datetime64_any_dtype(data[column]):
+				values = data[column].array
+				self.__columns[column] = values.asi8.view(f"datetime64[{values.unit}]")
+				self.__timestamps[column] = (values.asi8, values.unit, values.tz)
+			else:
+				self.__columns[column] = data[column].to_numpy()
+
+	def _add_column(self, key: str, values: np.ndarray):
+		if key in self.__columns:
+			raise Exception(f"Column '{key}' already exists")
+
+		if len(values) != self.__length:
+			raise Exception(f"Column '{key}' must be aligned with the data feed")
+
+		self.__columns[key] = values
+
+	def _seek(self, index: int):
+		self.__index = index
+		self.__boxed.clear()
+
+	@property
+	def index(self) -> int:
+		return self.__index
+
+	@property
+	def length(self) -> int:
+		return self.__length
+
+	@property
+	def columns(self) -> list:
+		return list(self.__columns.keys())
+
+	def column(self, key: str) -> np.ndarray:
+		return self.__columns[key]
+
+	def datetimes(self, key: str = "datetime") -> pd.DatetimeIndex:
+		values, unit, tz = self.__timestamps[key]
+		index = pd.DatetimeIndex(values.view(f"datetime64[{unit}]"))
+		return index.tz_localize("UTC").tz_convert(tz) if tz is not None else index
+
+	def get_first_min_of_timeframe_mask(self, timeframe: str, key: str = "datetime") -> np.ndarray:
+		if ("first", timeframe, key) not in self.__masks:
+			self.__masks[("first", timeframe, key)] = utils.get_first_min_of_timeframe_mask(self.datetimes(key), timeframe)
+
+		return self.__masks[("first", timeframe, key)]
+
+	def get_last_min_of_timeframe_mask(self, timeframe: str, key: str = "datetime") -> np.ndarray:
+		if ("last", timeframe, key) not in self.__masks:
+			self.__masks[("last", timeframe, key)] = utils.get_last_min_of_timeframe_mask(self.datetimes(key), timeframe)
+
+		return self.__masks[("last", timeframe, key)]
+
+	def is_first_min_of_timeframe(self, timeframe: str, key: str = "datetime") -> bool:
+		return bool(self.get_first_min_of_timeframe_mask(timeframe, key)[self.__index])
+
+	def is_last_min_of_timeframe(self, timeframe: str, key: str = "datetime") -> bool:
+		return bool(self.get_last_min_of_timeframe_mask(timeframe, key)[self.__index])
+
+	def __getitem__(self, key: str):
+		if key in self.__timestamps:
+			if key not in self.__boxed:
+				values, unit, tz = self.__timestamps[key]
+				self.__boxed[key] = pd.Timestamp(values[self.__index], unit=unit, tz=tz)
+
+			return self.__boxed[key]
+
+		return self.__columns[key][self.__index]
+
+	def __contains__(self, key: str) -> bool:
+		return key in self.__columns
+
+	def __iter__(self):
+		return iter(self.__columns)
+
+	def __len__(self) -> int:
+		return len(self.__columns)
+
+	def __repr__(self) -> str:
+		return f"Bar({self.__index}, {dict(self)})"
@@ -0,0 +1,164 @@
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+from typing import Iterator, Union
+import json
+import os
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_datetime64_any_dtype
+
+BINANCE_CSV_COLUMNS = ["open_time", "open", "high", "low", "close", "volume"]
+
+def iter_csv(files: list[str], names: list[str] = BINANCE_CSV_COLUMNS, time_unit: str = "ms") -> Iterator[pd.DataFrame]:
+	for file_path in files:
+		data = pd.read_csv(file_path, sep=",", header=0, usecols=list(range(len(names))))
+		data.columns = names
+		data["datetime"] = pd.to_datetime(data[names[0]], unit=time_unit, utc=True).dt.as_unit("ns")
+		yield data.drop(columns=[names[0]]).set_index("datetime")
+
+class BarStore:
+	def __init__(self, path: str):
+		self.__path = path
+		self.__meta = self.__read_meta()
+
+	def __read_meta(self) -> dict:
+		meta_path = os.path.join(self.__path, "meta.json")
+
+		if not os.path.exists(meta_path):
+			return {"columns": [], "tz": None}
+
+		with open(meta_path, "r") as f:
+			return json.load(f)
+
+	def __write_meta(self):
+		os.makedirs(self.__path, exist_ok=True)
+		tmp_path = os.path.join(self.__path, "meta.json.tmp")
+
+		with open(tmp_path, "w") as f:
+			json.dump(self.__meta, f)
+
+		os.replace(tmp_path, os.path.join(self.__path, "meta.json"))
+
+	def __save(self, month: str, column: str, values: np.ndarray):
+		month_path = os.path.join(self.__path, month)
+		os.makedirs(month_path, exist_ok=True)
+		tmp_path = os.path.join(month_path, f"{column}.tmp.npy")
+		np.save(tmp_path, values)
+		os.replace(tmp_path, os.path.join(month_path, f"{column}.npy"))
+
+	def __load(self, month: str, column: str) -> np.ndarray:
+		return np.load(os.path.join(self.__path, month, f"{column}.npy"), mmap_mode="r")
+
+	@property
+	def path(self) -> str:
+		return self.__path
+
+	@property
+	def columns(self) -> list[str]:
+		return list(self.__meta["columns"])
+
+	@property
+	def months(self) -> list[str]:
+		if not os.path.isdir(self.__path):
+			return []
+
+		return sorted(x for x in os.listdir(self.__path) if os.path.isdir(os.path.join(self.__path, x)))
+
+	def write(self, data: pd.DataFrame):
+		if "datetime" in data.columns:
+			data = data.set_index("datetime")
+
+		if not is_datetime64_any_dtype(data.index):
+			raise Exception("Data must be indexed by 'datetime' as Pandas Timestamp")
+
+		if len(self.__meta["columns"]) == 0:
+			self.__meta = {"columns": list(data.columns), "tz": str(data.index.tz) if data.index.tz is not None else None}
+		elif list(data.columns) != self.__meta["columns"]:
+			raise Exception(f"Columns must match the store columns {self.__meta['columns']}")
+
+		# Partitions are kept in naive UTC nanoseconds, the original timezone is restored on read.
+		index = data.index.tz_convert(None) if data.index.tz is not None else data.index
+		data = data.set_axis(index.as_unit("ns"), axis=0)
+
+		for month, part in data.groupby(data.index.strftime("%Y-%m")):
+			if os.path.exists(os.path.join(self.__path, month, "datetime.npy")):
+				part = pd.concat([self.__read_month(month, self.columns), part])
+
+			part = part[~part.index.duplicated(keep="last")].sort_index()
+			self.__save(month, "datetime", part.index.asi8)
+
+			for column in self.columns:
+				self.__save(month, column, part[column].to_numpy())
+
+		self.__write_meta()
+
+	def ingest_csv(self, files: list[str], names: list[str] = BINANCE_CSV_COLUMNS, time_unit: str = "ms"):
+		for data in iter_csv(files, names=names, time_unit=time_unit):
+			self.write(data)
+
+	def __slices(self, month: str, columns: list[str], start: Union[int, None] = None, end: Union[int, None] = None) -> dict:
+		datetimes = self.__load(month, "datetime")
+		i = np.searchsorted(datetimes, start, side="left") if start is not None else 0
+		j = np.searchsorted(datetimes, end, side="left") if end is not None else len(datetimes)
+		slices = {c: self.__load(month, c)[i:j] for c in columns}
+		slices["datetime"] = datetimes[i:j]
+		return slices
+
+	def __read_month(self, month: str, columns: list[str]) -> pd.DataFrame:
+		slices = self.__slices(month, columns)
+		index = pd.DatetimeIndex(np.asarray(slices.pop("datetime")).view("datetime64[ns]"), name="datetime")
+		return pd.DataFrame({c: np.asarray(slices[c]) for c in columns}, index=index)
+
+	def __parts(self, columns: Union[list[str], None], start, end) -> Iterator[dict]:
+		for column in columns:
+			if column not in self.__meta["columns"]:
+				raise Exception(f"Unknown column '{column}'")
+
+		start = pd.Timestamp(start).as_unit("ns").value if start is not None else None
+		end = pd.Timestamp(end).as_unit("ns").value if end is not None else None
+
+		for month in self.months:
+			month_start = pd.Timestamp(f"{month}-01")
+			month_end = (month_start + pd.DateOffset(months=1)).as_unit("ns").value
+			month_start = month_start.as_unit("ns").value
+
+			if (start is not None and month_end <= start) or (end is not None and month_start >= end):
+				continue
+
+			# Only the requested columns of the overlapping months are touched, the rest stays on disk.
+			yield self.__slices(
+				month,
+				columns,
+				start if start is not None and start > month_start else None,
+				end if end is not None and end < month_end else None
+			)
+
+	def __frame(self, parts: list[dict], columns: list[str]) -> pd.DataFrame:
+		datetimes = np.concatenate([p["datetime"] for p in parts]) if len(parts) > 0 else np.array([], dtype=np.int64)
+		index = pd.DatetimeIndex(datetimes.view("datetime64[ns]"), name="datetime")
+
+		if self.__meta["tz"] is not None:
+			index = index.tz_localize("UTC").tz_convert(self.__meta["tz"])
+
+		return pd.DataFrame({c: np.concatenate([p[c] for p in parts]) if len(parts) > 0 else np.array([]) for c in columns}, index=index)
+
+	def read(
+		self,
+		columns: Union[list[str], None] = None,
+		start: Union[pd.Timestamp, str, None] = None,
+		end: Union[pd.Timestamp, str, None] = None
+	) -> pd.DataFrame:
+		columns = columns if columns is not None else self.columns
+		return self.__frame(list(self.__parts(columns, start, end)), columns)
+
+	def iter_chunks(
+		self,
+		columns: Union[list[str], None] = None,
+		start: Union[pd.Timestamp, str, None] = None,
+		end: Union[pd.Timestamp, str, None] = None
+	) -> Iterator[pd.DataFrame]:
+		columns = columns if columns is not None else self.columns
+
+		# One month is loaded at a time, a chunked backtest never holds the whole range in memory.
+		for part in self.__parts(columns, start, end):
+			if len(part["datetime"]) > 0:
+				yield self.__frame([part], columns)
@@ -11,6 +11,9 @@ class Broker:
 	def _sub_cash(self, amount: float):
 		self.__cash -= amount
 
+	def _set_cash(self, amount: float):
+		self.__cash = amount
+
 	@property
 	def start_cash(self) -> float:
 		return self.__start_cash
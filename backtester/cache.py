@@ -0,0 +1,188 @@
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Union
+import hashlib
+import os
+import shutil
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_datetime64_any_dtype
+
+try:
+	import fcntl
+except ImportError:
+	fcntl = None
+
+def _update(h, value):
+	if isinstance(value, pd.DataFrame):
+		h.update(repr(list(value.columns)).encode())
+		_update(h, value.index)
+
+		for column in value.columns:
+			_update(h, value[column])
+	elif isinstance(value, (pd.Series, pd.Index)):
+		if is_datetime64_any_dtype(value.dtype):
+			h.update(str(value.dtype).encode())
+			h.update(np.ascontiguousarray(value.array.asi8).data)
+		else:
+			_update(h, value.to_numpy())
+	elif isinstance(value, np.ndarray) and value.dtype != object:
+		h.update(f"{value.dtype}{value.shape}".encode())
+		h.update(np.ascontiguousarray(value).data)
+	else:
+		h.update(repr(value.tolist() if isinstance(value, np.ndarray) else value).encode())
+
+def fingerprint(*values) -> str:
+	h = hashlib.blake2b(digest_size=16)
+
+	for value in values:
+		_update(h, value)
+
+	return h.hexdigest()
+
+class MemoryCache:
+	def __init__(self, max_items: int = 32):
+		self.__max_items = max_items
+		self.__items = OrderedDict()
+
+	def get(self, key: str):
+		if key not in self.__items:
+			return None
+
+		self.__items.move_to_end(key)
+		return self.__items[key]
+
+	def set(self, key: str, value):
+		self.__items[key] = value
+		self.__items.move_to_end(key)
+
+		while len(self.__items) > self.__max_items:
+			self.__items.popitem(last=False)
+
+	def clear(self):
+		self.__items.clear()
+
+	def __contains__(self, key: str) -> bool:
+		return key in self.__items
+
+	def __len__(self) -> int:
+		return len(self.__items)
+
+class DiskCache:
+	def __init__(self, path: str, max_bytes: Union[int, None] = None):
+		self.__path = path
+		self.__max_bytes = max_bytes
+
+	@property
+	def path(self) -> str:
+		return self.__path
+
+	@property
+	def max_bytes(self) -> Union[int, None]:
+		return self.__max_bytes
+
+	@property
+	def size(self) -> int:
+		return sum(size for _, size, _ in self.__entries())
+
+	@contextmanager
+	def __lock(self):
+		os.makedirs(self.__path, exist_ok=True)
+
+		# Sweep workers share one cache directory, writers and eviction take an exclusive lock on it.
+		with open(os.path.join(self.__path, ".lock"), "a+") as f:
+			if fcntl is not None:
+				fcntl.flock(f, fcntl.LOCK_EX)
+
+			try:
+				yield
+			finally:
+				if fcntl is not None:
+					fcntl.flock(f, fcntl.LOCK_UN)
+
+	def __entries(self) -> list[tuple]:
+		if not os.path.isdir(self.__path):
+			return []
+
+		entries = []
+
+		for name in os.listdir(self.__path):
+			entry_path = os.path.join(self.__path, name)
+
+			if name.startswith(".") or not os.path.isdir(entry_path):
+				continue
+
+			try:
+				size = sum(os.path.getsize(os.path.join(entry_path, f)) for f in os.listdir(entry_path))
+				entries.append((os.path.getmtime(entry_path), size, name))
+			except OSError:
+				continue
+
+		return sorted(entries)
+
+	def __remove(self, key: str):
+		# The entry disappears in one rename, readers that already mapped its files keep them.
+		tmp_path = os.path.join(self.__path, f".{key}.{os.getpid()}.evict")
+
+		try:
+			os.rename(os.path.join(self.__path, key), tmp_path)
+		except OSError:
+			return
+
+		shutil.rmtree(tmp_path, ignore_errors=True)
+
+	def __evict(self, keep: str):
+		entries = self.__entries()
+		total = sum(size for _, size, _ in entries)
+
+		for _, size, name in entries:
+			if total <= self.__max_bytes:
+				break
+
+			if name != keep:
+				self.__remove(name)
+				total -= size
+
+	def get(self, key: str) -> Union[dict, None]:
+		entry_path = os.path.join(self.__path, key)
+
+		if not os.path.isdir(entry_path):
+			return None
+
+		try:
+			arrays = {f[:-4]: np.load(os.path.join(entry_path, f), mmap_mode="r") for f in sorted(os.listdir(entry_path)) if f.endswith(".npy")}
+			# The directory's mtime is the entry's last use for LRU eviction.
+			os.utime(entry_path)
+		except (OSError, ValueError):
+			return None
+
+		return arrays
+
+	def set(self, key: str, arrays: dict):
+		os.makedirs(self.__path, exist_ok=True)
+		tmp_path = os.path.join(self.__path, f".{key}.{os.getpid()}.tmp")
+		os.makedirs(tmp_path, exist_ok=True)
+
+		for name, values in arrays.items():
+			np.save(os.path.join(tmp_path, f"{name}.npy"), values)
+
+		with self.__lock():
+			try:
+				os.rename(tmp_path, os.path.join(self.__path, key))
+			except OSError:
+				# Another process stored the same entry first.
+				shutil.rmtree(tmp_path, ignore_errors=True)
+
+			if self.__max_bytes is not None:
+				self.__evict(key)
+
+	def remove(self, key: str):
+		with self.__lock():
+			self.__remove(key)
+
+	def clear(self):
+		shutil.rmtree(self.__path, ignore_errors=True)
+
+	def __contains__(self, key: str) -> bool:
+		return os.path.isdir(os.path.join(self.__path, key))
@@ -1,14 +1,26 @@
 from __future__ import (absolute_import, division, print_function, unicode_literals)
+from typing import Union
 
 class Config:
 	def __init__(self):
 		self.__fee_rate = 0.001
 		self.__funding_rate = 0.0001
 		self.__funding_rate_hours = [0, 8, 16]
+		self.__funding_rates = {}
 		self.__leverage = 1
+		self.__liquidation = True
+		self.__liquidation_fee_rate = 0.005
 		self.__base_precision = 8
 		self.__quote_precision = 2
 		self.__price_precision = 2
+		self.__equity_curve = False
+		self.__equity_curve_timeframe = None
+		self.__metrics_only = False
+		self.__feature_cache_path = None
+		self.__feature_cache_max_bytes = None
+		self.__profiling = False
+		self.__checkpoint_path = None
+		self.__checkpoint_bars = 100000
 
 	@property
 	def fee_rate(self) -> float:
@@ -34,6 +46,17 @@ class Config:
 	def funding_rate_hours(self, hours: list[int]):
 		self.__funding_rate_hours = hours
 
+	@property
+	def funding_rates(self) -> dict:
+		return self.__funding_rates
+
+	@funding_rates.setter
+	def funding_rates(self, rates: dict):
+		self.__funding_rates = rates
+
+	def get_funding_rate(self, symbol: Union[str, None] = None) -> float:
+		return self.__funding_rates.get(symbol, self.__funding_rate)
+
 	@property
 	def leverage(self) -> int:
 		return self.__leverage
@@ -42,6 +65,22 @@ class Config:
 	def leverage(self, value: int):
 		self.__leverage = value
 
+	@property
+	def liquidation(self) -> bool:
+		return self.__liquidation
+
+	@liquidation.setter
+	def liquidation(self, value: bool):
+		self.__liquidation = value
+
+	@property
+	def liquidation_fee_rate(self) -> float:
+		return self.__liquidation_fee_rate
+
+	@liquidation_fee_rate.setter
+	def liquidation_fee_rate(self, value: float):
+		self.__liquidation_fee_rate = value
+
 	@property
 	def base_precision(self) -> int:
 		return self.__base_precision
@@ -65,3 +104,67 @@ class Config:
 	@price_precision.setter
 	def price_precision(self, value: int):
 		self.__price_precision = value
+
+	@property
+	def equity_curve(self) -> bool:
+		return self.__equity_curve
+
+	@equity_curve.setter
+	def equity_curve(self, value: bool):
+		self.__equity_curve = value
+
+	@property
+	def equity_curve_timeframe(self) -> Union[str, None]:
+		return self.__equity_curve_timeframe
+
+	@equity_curve_timeframe.setter
+	def equity_curve_timeframe(self, timeframe: Union[str, None]):
+		self.__equity_curve_timeframe = timeframe
+
+	@property
+	def metrics_only(self) -> bool:
+		return self.__metrics_only
+
+	@metrics_only.setter
+	def metrics_only(self, value: bool):
+		self.__metrics_only = value
+
+	@property
+	def feature_cache_path(self) -> Union[str, None]:
+		return self.__feature_cache_path
+
+	@feature_cache_path.setter
+	def feature_cache_path(self, path: Union[str, None]):
+		self.__feature_cache_path = path
+
+	@property
+	def feature_cache_max_bytes(self) -> Union[int, None]:
+		return self.__feature_cache_max_bytes
+
+	@feature_cache_max_bytes.setter
+	def feature_cache_max_bytes(self, value: Union[int, None]):
+		self.__feature_cache_max_bytes = value
+
+	@property
+	def profiling(self) -> bool:
+		return self.__profiling
+
+	@profiling.setter
+	def profiling(self, value: bool):
+		self.__profiling = value
+
+	@property
+	def checkpoint_path(self) -> Union[str, None]:
+		return self.__checkpoint_path
+
+	@checkpoint_path.setter
+	def checkpoint_path(self, path: Union[str, None]):
+		self.__checkpoint_path = path
+
+	@property
+	def checkpoint_bars(self) -> int:
+		return self.__checkpoint_bars
+
+	@checkpoint_bars.setter
+	def checkpoint_bars(self, value: int):
+		self.__checkpoint_bars = value
@@ -0,0 +1,81 @@
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+from typing import Union
+import numpy as np
+import pandas as pd
+
+def get_drawdown(equity: np.ndarray, highs: Union[np.ndarray, None] = None) -> np.ndarray:
+	equity = np.asarray(equity, dtype=np.float64)
+	highs = np.asarray(highs, dtype=np.float64) if highs is not None else equity
+	peaks = np.fmax.accumulate(highs) if len(equity) > 0 else equity
+	return np.where(peaks > 0, (equity - peaks) / peaks, 0.0)
+
+def get_max_drawdown(equity: np.ndarray) -> tuple[float, float, int, int]:
+	equity = np.asarray(equity, dtype=np.float64)
+
+	if len(equity) == 0:
+		return 0.0, 0.0, -1, -1
+
+	peaks = np.fmax.accumulate(equity)
+	drawdown = np.where(peaks > 0, (equity - peaks) / peaks, 0.0)
+	trough = int(np.nanargmin(drawdown)) if not np.all(np.isnan(drawdown)) else 0
+
+	if drawdown[trough] >= 0:
+		return 0.0, 0.0, -1, -1
+
+	peak = int(np.flatnonzero(equity[:trough + 1] == peaks[trough])[-1])
+	return float(drawdown[trough]), float(equity[trough] - peaks[trough]), peak, trough
+
+def get_drawdown_periods(equity: np.ndarray, datetimes: Union[pd.DatetimeIndex, pd.Series, None] = None, highs: Union[np.ndarray, None] = None) -> pd.DataFrame:
+	equity = np.asarray(equity, dtype=np.float64)
+	highs = np.asarray(highs, dtype=np.float64) if highs is not None else equity
+	n = len(equity)
+	columns = ["start", "trough", "end", "peak", "trough_value", "amount", "depth_pct", "duration", "recovered"]
+
+	if n == 0:
+		return pd.DataFrame(columns=columns)
+
+	# Downsampled curves take their peaks from each candle's high and their troughs from its low.
+	peaks = np.fmax.accumulate(highs)
+	drawdown = np.where(peaks > 0, (equity - peaks) / peaks, 0.0)
+	underwater = drawdown < 0
+
+	# An episode runs from the bar before the equity drops below its peak to the bar it gets back to it.
+	edges = np.diff(np.r_[0, underwater.astype(np.int8), 0])
+	first = np.flatnonzero(edges == 1)
+	after = np.flatnonzero(edges == -1)
+
+	if len(first) == 0:
+		return pd.DataFrame(columns=columns)
+
+	start = np.maximum(first - 1, 0)
+	recovered = after < n
+	end = np.where(recovered, after, n - 1)
+	lengths = after - first
+	positions = np.flatnonzero(underwater)
+	values = drawdown[positions]
+	depths = np.minimum.reduceat(values, np.r_[0, np.cumsum(lengths)[:-1]])
+	segment = np.repeat(np.arange(len(first)), lengths)
+	hits = np.flatnonzero(values == depths[segment])
+	trough = positions[hits[np.unique(segment[hits], return_index=True)[1]]]
+
+	data = pd.DataFrame({
+		"start": start,
+		"trough": trough,
+		"end": end,
+		"peak": peaks[trough],
+		"trough_value": equity[trough],
+		"amount": equity[trough] - peaks[trough],
+		"depth_pct": depths * 100,
+		"duration": end - start,
+		"recovered": recovered
+	})
+
+	if datetimes is not None:
+		datetimes = pd.DatetimeIndex(datetimes)
+
+		for column in ["start", "trough", "end"]:
+			data[column] = datetimes[data[column].to_numpy()]
+
+		data["duration"] = data["end"] - data["start"]
+
+	return data
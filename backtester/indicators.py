@@ -0,0 +1,277 @@
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+from typing import Union
+import math
+import numpy as np
+import pandas as pd
+
+# Batch and streaming modes run the same float operations in the same order, so both give bit-identical values.
+
+def _rolling_sum(values: np.ndarray, period: int) -> np.ndarray:
+	deltas = values.astype(np.float64, copy=True)
+	deltas[period:] = values[period:] - values[:-period]
+	return np.cumsum(deltas)
+
+def _ewm(values: np.ndarray, alpha: float, period: int) -> np.ndarray:
+	return pd.Series(values).ewm(alpha=alpha, adjust=False, min_periods=period).mean().to_numpy()
+
+class _RollingSum:
+	def __init__(self, period: int):
+		self.__period = period
+		self.__window = [0.0] * period
+		self.__count = 0
+		self.__sum = 0.0
+
+	@property
+	def count(self) -> int:
+		return self.__count
+
+	def seed(self, values: np.ndarray):
+		self.__count = len(values)
+		self.__sum = float(_rolling_sum(values, self.__period)[-1]) if len(values) > 0 else 0.0
+		self.__window = [0.0] * self.__period
+
+		for i in range(max(len(values) - self.__period, 0), len(values)):
+			self.__window[i % self.__period] = float(values[i])
+
+	def update(self, value: float) -> float:
+		i = self.__count % self.__period
+
+		if self.__count < self.__period:
+			self.__sum += value
+		else:
+			self.__sum += value - self.__window[i]
+
+		self.__window[i] = value
+		self.__count += 1
+		return self.__sum
+
+class _Ewm:
+	def __init__(self, alpha: float):
+		self.__alpha = alpha
+		self.__decay = 1.0 - alpha
+		self.__count = 0
+		self.__value = math.nan
+
+	@property
+	def count(self) -> int:
+		return self.__count
+
+	def seed(self, values: np.ndarray):
+		self.__count = len(values)
+		self.__value = float(pd.Series(values).ewm(alpha=self.__alpha, adjust=False).mean().iloc[-1]) if len(values) > 0 else math.nan
+
+	def update(self, value: float) -> float:
+		if self.__count == 0:
+			self.__value = value
+		else:
+			self.__value = (self.__decay * self.__value + self.__alpha * value) / (self.__decay + self.__alpha)
+
+		self.__count += 1
+		return self.__value
+
+class Indicator:
+	def __init__(self, inputs: list[str], outputs: list[str]):
+		self.__inputs = inputs
+		self.__outputs = outputs
+
+	@property
+	def inputs(self) -> list[str]:
+		return self.__inputs
+
+	@property
+	def outputs(self) -> list[str]:
+		return self.__outputs
+
+	@property
+	def params(self) -> dict:
+		return {}
+
+	def compute(self, *columns: np.ndarray) -> list[np.ndarray]:
+		raise NotImplementedError
+
+	def reset(self):
+		raise NotImplementedError
+
+	def seed(self, *columns: np.ndarray):
+		# Leaves the streaming state where updates over these values would, indicators with a vectorized way override it.
+		self.reset()
+
+		for values in zip(*columns):
+			self.update(*values)
+
+	def update(self, *values: float) -> tuple:
+		raise NotImplementedError
+
+	def __repr__(self) -> str:
+		return f"{self.__class__.__name__}({self.params})"
+
+class SMA(Indicator):
+	def __init__(self, period: int, source: str = "close", name: Union[str, None] = None):
+		super().__init__([source], [name if name is not None else f"sma_{period}"])
+		self.__period = period
+		self.reset()
+
+	@property
+	def params(self) -> dict:
+		return {"period": self.__period, "source": self.inputs[0]}
+
+	def compute(self, values: np.ndarray) -> list[np.ndarray]:
+		sma = _rolling_sum(values, self.__period) / self.__period
+		sma[:self.__period - 1] = np.nan
+		return [sma]
+
+	def reset(self):
+		self.__sum = _RollingSum(self.__period)
+
+	def seed(self, values: np.ndarray):
+		self.__sum.seed(values)
+
+	def update(self, value: float) -> tuple:
+		total = self.__sum.update(value)
+		return (total / self.__period if self.__sum.count >= self.__period else math.nan,)
+
+class EMA(Indicator):
+	def __init__(self, period: int, source: str = "close", name: Union[str, None] = None):
+		super().__init__([source], [name if name is not None else f"ema_{period}"])
+		self.__period = period
+		self.__alpha = 2 / (period + 1)
+		self.reset()
+
+	@property
+	def params(self) -> dict:
+		return {"period": self.__period, "source": self.inputs[0]}
+
+	def compute(self, values: np.ndarray) -> list[np.ndarray]:
+		return [_ewm(values, self.__alpha, self.__period)]
+
+	def reset(self):
+		self.__ema = _Ewm(self.__alpha)
+
+	def seed(self, values: np.ndarray):
+		self.__ema.seed(values)
+
+	def update(self, value: float) -> tuple:
+		ema = self.__ema.update(value)
+		return (ema if self.__ema.count >= self.__period else math.nan,)
+
+class RSI(Indicator):
+	def __init__(self, period: int = 14, source: str = "close", name: Union[str, None] = None):
+		super().__init__([source], [name if name is not None else f"rsi_{period}"])
+		self.__period = period
+		self.reset()
+
+	@property
+	def params(self) -> dict:
+		return {"period": self.__period, "source": self.inputs[0]}
+
+	def compute(self, values: np.ndarray) -> list[np.ndarray]:
+		change = np.diff(values)
+		gain = _ewm(np.maximum(change, 0.0), 1 / self.__period, self.__period)
+		loss = _ewm(np.maximum(-change, 0.0), 1 / self.__period, self.__period)
+
+		with np.errstate(divide="ignore", invalid="ignore"):
+			rsi = 100 * gain / (gain + loss)
+
+		return [np.r_[np.nan, rsi]]
+
+	def reset(self):
+		self.__prev = None
+		self.__gain = _Ewm(1 / self.__period)
+		self.__loss = _Ewm(1 / self.__period)
+
+	def seed(self, values: np.ndarray):
+		change = np.diff(values)
+		self.__prev = values[-1] if len(values) > 0 else None
+		self.__gain.seed(np.maximum(change, 0.0))
+		self.__loss.seed(np.maximum(-change, 0.0))
+
+	def update(self, value: float) -> tuple:
+		prev, self.__prev = self.__prev, value
+
+		if prev is None:
+			return (math.nan,)
+
+		change = value - prev
+		gain = self.__gain.update(max(change, 0.0))
+		loss = self.__loss.update(max(-change, 0.0))
+
+		if self.__gain.count < self.__period or gain + loss == 0:
+			return (math.nan,)
+
+		return (100 * gain / (gain + loss),)
+
+class ATR(Indicator):
+	def __init__(self, period: int = 14, name: Union[str, None] = None):
+		super().__init__(["high", "low", "close"], [name if name is not None else f"atr_{period}"])
+		self.__period = period
+		self.reset()
+
+	@property
+	def params(self) -> dict:
+		return {"period": self.__period}
+
+	def compute(self, high: np.ndarray, low: np.ndarray, close: np.ndarray) -> list[np.ndarray]:
+		prev_close = np.r_[np.nan, close[:-1]]
+		true_range = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+		return [_ewm(true_range, 1 / self.__period, self.__period)]
+
+	def reset(self):
+		self.__prev_close = math.nan
+		self.__true_range = _Ewm(1 / self.__period)
+
+	def seed(self, high: np.ndarray, low: np.ndarray, close: np.ndarray):
+		prev_close = np.r_[np.nan, close[:-1]]
+		self.__prev_close = close[-1] if len(close) > 0 else math.nan
+		self.__true_range.seed(np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close))))
+
+	def update(self, high: float, low: float, close: float) -> tuple:
+		true_range = high - low
+
+		if not math.isnan(self.__prev_close):
+			true_range = max(true_range, abs(high - self.__prev_close), abs(low - self.__prev_close))
+
+		self.__prev_close = close
+		atr = self.__true_range.update(true_range)
+		return (atr if self.__true_range.count >= self.__period else math.nan,)
+
+class BollingerBands(Indicator):
+	def __init__(self, period: int = 20, k: float = 2, source: str = "close", name: Union[str, None] = None):
+		name = name if name is not None else f"bb_{period}"
+		super().__init__([source], [f"{name}_mid", f"{name}_upper", f"{name}_lower"])
+		self.__period = period
+		self.__k = k
+		self.reset()
+
+	@property
+	def params(self) -> dict:
+		return {"period": self.__period, "k": self.__k, "source": self.inputs[0]}
+
+	def compute(self, values: np.ndarray) -> list[np.ndarray]:
+		mid = _rolling_sum(values, self.__period) / self.__period
+		var = _rolling_sum(values * values, self.__period) / self.__period - mid * mid
+		std = np.sqrt(np.maximum(var, 0.0))
+		upper = mid + self.__k * std
+		lower = mid - self.__k * std
+
+		for x in [mid, upper, lower]:
+			x[:self.__period - 1] = np.nan
+
+		return [mid, upper, lower]
+
+	def reset(self):
+		self.__sum = _RollingSum(self.__period)
+		self.__squares = _RollingSum(self.__period)
+
+	def seed(self, values: np.ndarray):
+		self.__sum.seed(values)
+		self.__squares.seed(values * values)
+
+	def update(self, value: float) -> tuple:
+		mid = self.__sum.update(value) / self.__period
+		var = self.__squares.update(value * value) / self.__period - mid * mid
+
+		if self.__sum.count < self.__period:
+			return (math.nan, math.nan, math.nan)
+
+		std = math.sqrt(max(var, 0.0))
+		return (mid, mid + self.__k * std, mid - self.__k * std)
@@ -0,0 +1,158 @@
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+from typing import Union
+import numpy as np
+import pandas as pd
+
+_DATETIME = "datetime"
+_FLOAT = "float"
+
+class Journal:
+	def __init__(self, columns: list[tuple], capacity: int = 1024, tz=None):
+		self.__columns = columns
+		self.__names = [name for name, _ in columns]
+		self.__floats = [name for name, kind in columns if kind == _FLOAT]
+		self.__categories = {name: list(kind) for name, kind in columns if isinstance(kind, (list, tuple))}
+		self.__codes = {name: {v: i for i, v in enumerate(kind)} for name, kind in self.__categories.items()}
+		self.__tz = tz
+		self.__length = 0
+		self.__capacity = max(capacity, 1)
+		self.__datetime_values = np.empty(self.__capacity, dtype=np.int64)
+		self.__float_values = np.empty((len(self.__floats), self.__capacity), dtype=np.float64)
+		self.__code_dtypes = {name: np.int8 if len(kind) < 128 else np.int32 for name, kind in self.__categories.items()}
+		self.__code_values = {name: np.empty(self.__capacity, dtype=self.__code_dtypes[name]) for name in self.__categories}
+		self.__float_positions = {name: i for i, name in enumerate(self.__floats)}
+
+	def __grow(self, length: int):
+		if length <= self.__capacity:
+			return
+
+		capacity = self.__capacity
+
+		while capacity < length:
+			capacity *= 2
+
+		datetime_values = np.empty(capacity, dtype=np.int64)
+		datetime_values[:self.__length] = self.__datetime_values[:self.__length]
+		float_values = np.empty((len(self.__floats), capacity), dtype=np.float64)
+		float_values[:, :self.__length] = self.__float_values[:, :self.__length]
+
+		for name, values in self.__code_values.items():
+			code_values = np.empty(capacity, dtype=self.__code_dtypes[name])
+			code_values[:self.__length] = values[:self.__length]
+			self.__code_values[name] = code_values
+
+		self.__datetime_values = datetime_values
+		self.__float_values = float_values
+		self.__capacity = capacity
+
+	@property
+	def tz(self):
+		return self.__tz
+
+	@tz.setter
+	def tz(self, tz):
+		self.__tz = tz
+
+	@property
+	def columns(self) -> list[str]:
+		return self.__names
+
+	def append(self, row: list):
+		if self.__length == self.__capacity:
+			self.__grow(self.__length + 1)
+
+		i = self.__length
+
+		for (name, kind), value in zip(self.__columns, row):
+			if kind == _DATETIME:
+				if self.__tz is None and value.tz is not None:
+					self.__tz = value.tz
+
+				self.__datetime_values[i] = value.value
+			elif kind == _FLOAT:
+				self.__float_values[self.__float_positions[name], i] = value
+			else:
+				self.__code_values[name][i] = self.__codes[name][value]
+
+		self.__length += 1
+
+	def extend(self, columns: dict):
+		length = len(next(iter(columns.values())))
+		self.__grow(self.__length + length)
+		i, j = self.__length, self.__length + length
+
+		for name, kind in self.__columns:
+			values = columns[name]
+
+			if kind == _DATETIME:
+				index = pd.DatetimeIndex(values)
+
+				if self.__tz is None and index.tz is not None:
+					self.__tz = index.tz
+
+				self.__datetime_values[i:j] = index.as_unit("ns").asi8
+			elif kind == _FLOAT:
+				self.__float_values[self.__float_positions[name], i:j] = values
+			else:
+				self.__code_values[name][i:j] = pd.Categorical(values, categories=self.__categories[name]).codes
+
+		self.__length = j
+
+	def _truncate(self, length: int):
+		length = min(self.__length, max(length, 0))
+
+		if length == self.__length:
+			return
+
+		# Frames already handed out are views of the buffers, so the kept rows move to new ones before being written over.
+		self.__datetime_values = self.__datetime_values.copy()
+		self.__float_values = self.__float_values.copy()
+		self.__code_values = {name: values.copy() for name, values in self.__code_values.items()}
+		self.__length = length
+
+	def to_frame(self) -> pd.DataFrame:
+		n = self.__length
+		data = pd.DataFrame(self.__float_values[:, :n].T, columns=self.__floats, copy=False)
+
+		for position, (name, kind) in enumerate(self.__columns):
+			if kind == _DATETIME:
+				dtype = pd.DatetimeTZDtype("ns", self.__tz) if self.__tz is not None else "datetime64[ns]"
+				index = pd.DatetimeIndex(self.__datetime_values[:n], dtype=dtype, copy=False)
+				data.insert(position, name, pd.Series(index.array, copy=False))
+			elif kind != _FLOAT:
+				values = pd.Categorical.from_codes(self.__code_values[name][:n], categories=self.__categories[name])
+				data.insert(position, name, pd.Series(values, copy=False))
+
+		return data
+
+	def __row(self, i: int) -> list:
+		row = []
+
+		for name, kind in self.__columns:
+			if kind == _DATETIME:
+				row.append(pd.Timestamp(self.__datetime_values[i], unit="ns", tz=self.__tz))
+			elif kind == _FLOAT:
+				row.append(float(self.__float_values[self.__float_positions[name], i]))
+			else:
+				row.append(self.__categories[name][self.__code_values[name][i]])
+
+		return row
+
+	def __len__(self) -> int:
+		return self.__length
+
+	def __getitem__(self, i: Union[int, slice]) -> list:
+		if isinstance(i, slice):
+			return [self.__row(x) for x in range(*i.indices(self.__length))]
+
+		if i < 0:
+			i += self.__length
+
+		if i < 0 or i >= self.__length:
+			raise IndexError("Journal index out of range")
+
+		return self.__row(i)
+
+	def __iter__(self):
+		for i in range(self.__length):
+			yield self.__row(i)
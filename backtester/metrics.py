@@ -0,0 +1,366 @@
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+from typing import Union
+import math
+import numpy as np
+import pandas as pd
+from . import config
+from .reference import *
+from .broker import *
+from .profiler import *
+
+_DAY = 86400 * 10 ** 9
+
+def _get_day(ts: pd.Timestamp) -> int:
+	# Days follow the wall clock of the data feed, the same bins Report groups by.
+	return (ts.tz_localize(None) if ts.tz is not None else ts).value // _DAY
+
+class _Moments:
+	def __init__(self):
+		self.count = 0
+		self.mean = 0.0
+		self.m2 = 0.0
+
+	def add(self, value: float, count: int = 1):
+		if count <= 0:
+			return
+
+		# Chan's parallel update, `count` equal values are merged in one step.
+		total = self.count + count
+		delta = value - self.mean
+		self.mean += delta * count / total
+		self.m2 += delta * delta * self.count * count / total
+		self.count = total
+
+	def copy(self):
+		moments = _Moments()
+		moments.count, moments.mean, moments.m2 = self.count, self.mean, self.m2
+		return moments
+
+	@property
+	def std(self) -> float:
+		return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else math.nan
+
+class _Drawdown:
+	def __init__(self):
+		self.count = 0
+		self.peak = -math.inf
+		self.max_drawdown = 0.0
+		self.max_drawdown_amount = 0.0
+
+	def add(self, value: float):
+		self.count += 1
+		self.peak = max(self.peak, value)
+
+		if self.peak > 0 and (value - self.peak) / self.peak < self.max_drawdown:
+			self.max_drawdown = (value - self.peak) / self.peak
+			self.max_drawdown_amount = value - self.peak
+
+	def copy(self):
+		drawdown = _Drawdown()
+		drawdown.count, drawdown.peak = self.count, self.peak
+		drawdown.max_drawdown, drawdown.max_drawdown_amount = self.max_drawdown, self.max_drawdown_amount
+		return drawdown
+
+	def extend(self, values: np.ndarray):
+		if len(values) == 0:
+			return
+
+		peaks = np.fmax.accumulate(np.r_[self.peak, values])[1:]
+		drawdown = np.where(peaks > 0, (values - peaks) / peaks, 0.0)
+		i = int(np.nanargmin(drawdown)) if not np.all(np.isnan(drawdown)) else 0
+
+		if drawdown[i] < self.max_drawdown:
+			self.max_drawdown = float(drawdown[i])
+			self.max_drawdown_amount = float(values[i] - peaks[i])
+
+		self.count += len(values)
+		self.peak = float(peaks[-1])
+
+class Metrics:
+	def __init__(self, start_cash: float, start_datetime: pd.Timestamp, cfg: config.Config):
+		self.__quote_precision = cfg.quote_precision
+		self.__start_cash = start_cash
+		self.__start_datetime = start_datetime
+		self.__balance = start_cash
+		self.__day = _get_day(start_datetime) - 1
+		self.__day_close = None
+		self.__returns = _Moments()
+		self.__realized_drawdown = _Drawdown()
+		self.__equity_drawdown = _Drawdown()
+		self.__fees = {TRANSACTION_TYPE_COMMISSION: 0.0, TRANSACTION_TYPE_FUNDING_FEE: 0.0, TRANSACTION_TYPE_LIQUIDATION_FEE: 0.0, TRANSACTION_TYPE_REALIZED_PNL: 0.0}
+		self.__wins = 0
+		self.__losses = 0
+		self.__realized_qty = 0
+		self.__trades_qty = 0
+		self.__turnover = 0.0
+		self.__realized_pnl = 0.0
+		self.__longs = 0
+		self.__shorts = 0
+		self.__open = {}
+		self.__exposed_since = None
+		self.__exposure = 0
+
+	def __close_day(self):
+		if self.__day_close is not None:
+			self.__returns.add(self.__balance / self.__day_close - 1)
+
+		self.__day_close = self.__balance
+		self.__realized_drawdown.add(self.__balance)
+
+	def __roll(self, day: int):
+		if day <= self.__day:
+			return
+
+		# Days without transactions carry the balance over, each one is a zero return.
+		self.__close_day()
+		self.__returns.add(0.0, day - self.__day - 1)
+
+		self.__day = day
+
+	def add_transaction(self, row: list):
+		datetime, kind, amount = row[:3]
+		# Amounts are rounded like Report rounds its journals, so both give the same figures.
+		amount = float(np.round(amount, self.__quote_precision))
+		self.__roll(_get_day(datetime))
+		self.__balance += amount
+		self.__fees[kind] += amount
+
+		if kind == TRANSACTION_TYPE_REALIZED_PNL:
+			self.__realized_qty += 1
+			self.__wins += amount > 0
+			self.__losses += amount < 0
+
+	def add_trade(self, row: list):
+		datetime, side, quantity, price, notional, fee, realized_pnl = row[:7]
+		symbol = row[7] if len(row) > 7 else None
+		self.__trades_qty += 1
+		self.__turnover += float(np.round(notional, self.__quote_precision))
+		exposed = len(self.__open) > 0
+
+		# Open quantities are tracked per symbol and side, exposure is any of them being open.
+		if math.isnan(realized_pnl):
+			self.__longs += side == ORDER_SIDE_BUY
+			self.__shorts += side == ORDER_SIDE_SELL
+			key = (symbol, POSITION_SIDE_LONG if side == ORDER_SIDE_BUY else POSITION_SIDE_SHORT)
+			self.__open[key] = self.__open.get(key, 0.0) + quantity
+		else:
+			self.__realized_pnl += float(np.round(realized_pnl, self.__quote_precision))
+			key = (symbol, POSITION_SIDE_LONG if side == ORDER_SIDE_SELL else POSITION_SIDE_SHORT)
+			self.__open[key] = self.__open.get(key, 0.0) - quantity
+
+		if self.__open[key] <= 0:
+			del self.__open[key]
+
+		is_exposed = len(self.__open) > 0
+
+		if is_exposed and not exposed:
+			self.__exposed_since = datetime.value
+		elif exposed and not is_exposed:
+			self.__exposure += datetime.value - self.__exposed_since
+
+	def add_portfolio_history(self, row: list):
+		pass
+
+	def extend_transactions(self, columns: dict):
+		for row in zip(*[columns[x] for x in ["datetime", "type", "amount"]]):
+			self.add_transaction([pd.Timestamp(row[0]), row[1], float(row[2])])
+
+	def extend_trades(self, columns: dict):
+		for row in zip(*[columns[x] for x in ["datetime", "side", "quantity", "price", "notional", "fee", "realized_pnl"]]):
+			self.add_trade([pd.Timestamp(row[0])] + [row[1]] + [float(x) for x in row[2:]])
+
+	def extend_portfolio_history(self, columns: dict):
+		pass
+
+	def extend_equity_curve(self, equity: np.ndarray):
+		self.__equity_drawdown.extend(equity)
+
+	def get_equity_curve_mark(self) -> tuple:
+		drawdown = self.__equity_drawdown
+		return drawdown.count, drawdown.peak, drawdown.max_drawdown, drawdown.max_drawdown_amount
+
+	def rewind_equity_curve(self, mark: tuple):
+		drawdown = self.__equity_drawdown
+		drawdown.count, drawdown.peak, drawdown.max_drawdown, drawdown.max_drawdown_amount = mark
+
+	@property
+	def start_cash(self) -> float:
+		return self.__start_cash
+
+	@property
+	def balance(self) -> float:
+		return self.__balance
+
+	@property
+	def returns(self) -> tuple[int, float, float]:
+		# The last day is closed on a copy so the accumulator keeps running.
+		moments = self.__returns.copy()
+
+		if self.__day_close is not None:
+			moments.add(self.__balance / self.__day_close - 1)
+
+		return moments.count, moments.mean, moments.std
+
+	@property
+	def drawdown(self) -> tuple[float, float]:
+		if self.__equity_drawdown.count > 0:
+			return self.__equity_drawdown.max_drawdown, self.__equity_drawdown.max_drawdown_amount
+
+		drawdown = self.__realized_drawdown.copy()
+		drawdown.add(self.__balance)
+		return drawdown.max_drawdown, drawdown.max_drawdown_amount
+
+	@property
+	def fees(self) -> dict:
+		return dict(self.__fees)
+
+	@property
+	def wins(self) -> int:
+		return self.__wins
+
+	@property
+	def losses(self) -> int:
+		return self.__losses
+
+	@property
+	def realized_qty(self) -> int:
+		return self.__realized_qty
+
+	@property
+	def trades_qty(self) -> int:
+		return self.__trades_qty
+
+	@property
+	def turnover(self) -> float:
+		return self.__turnover
+
+	@property
+	def realized_pnl(self) -> float:
+		return self.__realized_pnl
+
+	@property
+	def longs(self) -> int:
+		return self.__longs
+
+	@property
+	def shorts(self) -> int:
+		return self.__shorts
+
+	def get_exposure(self, end_datetime: pd.Timestamp) -> int:
+		if self.__exposed_since is not None and len(self.__open) > 0:
+			return self.__exposure + end_datetime.value - self.__exposed_since
+
+		return self.__exposure
+
+class MetricsReport(object):
+	def __init__(self, strategy: str, broker: Broker, cfg: config.Config, metrics: Metrics, start_datetime: pd.Timestamp, end_datetime: pd.Timestamp):
+		self.__strategy = strategy
+		self.__start_datetime = start_datetime
+		self.__end_datetime = end_datetime
+		self.__broker = broker
+		self.__config = cfg
+		self.__metrics = metrics
+		self.__profile = None
+
+	@property
+	def strategy(self) -> str:
+		return self.__strategy
+
+	@property
+	def profile(self) -> Union[Profiler, None]:
+		return self.__profile
+
+	def _set_profile(self, profiler: Profiler):
+		self.__profile = profiler
+
+	@property
+	def start_datetime(self) -> pd.Timestamp:
+		return self.__start_datetime
+
+	@property
+	def end_datetime(self) -> pd.Timestamp:
+		return self.__end_datetime
+
+	@property
+	def start_cash(self) -> float:
+		return self.__broker.start_cash
+
+	@property
+	def sharpe_ratio(self) -> float:
+		count, mean, std = self.__metrics.returns
+		return ((count + 1) ** 0.5) * (mean / std) if count > 0 else math.nan
+
+	@property
+	def daily_return(self) -> float:
+		count, mean, _ = self.__metrics.returns
+		return mean if count > 0 else math.nan
+
+	@property
+	def end_cash(self) -> float:
+		return self.__metrics.balance
+
+	@property
+	def cumulative_return(self) -> float:
+		return self.end_cash - self.__broker.start_cash
+
+	@property
+	def cumulative_return_pct(self) -> float:
+		return (self.cumulative_return / self.__broker.start_cash) * 100
+
+	@property
+	def max_drawdown(self) -> float:
+		return self.__metrics.drawdown[1]
+
+	@property
+	def max_drawdown_pct(self) -> float:
+		return self.__metrics.drawdown[0] * 100
+
+	@property
+	def fees(self) -> dict:
+		fees = self.__metrics.fees
+		return {x: fees[x] for x in [TRANSACTION_TYPE_COMMISSION, TRANSACTION_TYPE_FUNDING_FEE, TRANSACTION_TYPE_LIQUIDATION_FEE]}
+
+	@property
+	def total_fees(self) -> float:
+		return sum(self.fees.values())
+
+	@property
+	def realized_pnl(self) -> float:
+		return self.__metrics.realized_pnl
+
+	@property
+	def turnover(self) -> float:
+		return self.__metrics.turnover
+
+	@property
+	def trades_qty(self) -> float:
+		return self.__metrics.trades_qty / 2
+
+	@property
+	def win_ratio(self) -> float:
+		qty = self.__metrics.realized_qty
+		return self.__metrics.wins / qty * 100 if qty > 0 else 0
+
+	@property
+	def loss_ratio(self) -> float:
+		qty = self.__metrics.realized_qty
+		return self.__metrics.losses / qty * 100 if qty > 0 else 0
+
+	@property
+	def long_ratio(self) -> float:
+		qty = self.__metrics.longs + self.__metrics.shorts
+		return self.__metrics.longs / qty * 100 if qty > 0 else 0
+
+	@property
+	def short_ratio(self) -> float:
+		qty = self.__metrics.longs + self.__metrics.shorts
+		return self.__metrics.shorts / qty * 100 if qty > 0 else 0
+
+	@property
+	def exposure(self) -> pd.Timedelta:
+		return pd.Timedelta(self.__metrics.get_exposure(self.__end_datetime), unit="ns")
+
+	@property
+	def exposure_pct(self) -> float:
+		duration = self.__end_datetime.value - self.__start_datetime.value
+		return self.__metrics.get_exposure(self.__end_datetime) / duration * 100 if duration > 0 else 0
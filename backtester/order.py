@@ -0,0 +1,38 @@
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+import pandas as pd
+
+class Order:
+	def __init__(self, type: str, side: str, price: float, quantity: float, created_at: pd.Timestamp, close_price_column: str = "close"):
+		self.__type = type
+		self.__side = side
+		self.__price = price
+		self.__quantity = quantity
+		self.__created_at = created_at
+		self.__close_price_column = close_price_column
+
+	@property
+	def type(self) -> str:
+		return self.__type
+
+	@property
+	def side(self) -> str:
+		return self.__side
+
+	@property
+	def price(self) -> float:
+		return self.__price
+
+	@property
+	def quantity(self) -> float:
+		return self.__quantity
+
+	@property
+	def created_at(self) -> pd.Timestamp:
+		return self.__created_at
+
+	@property
+	def close_price_column(self) -> str:
+		return self.__close_price_column
+
+	def __repr__(self) -> str:
+		return f"Order({self.__type}, {self.__side}, {self.__price}, {self.__quantity})"
@@ -0,0 +1,157 @@
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+from typing import Union
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_datetime64_any_dtype
+
+class Panel:
+	def __init__(self, feeds: dict, fields: Union[list[str], None] = None, fill: bool = True):
+		if len(feeds) == 0:
+			raise Exception("Panel needs at least one feed")
+
+		frames = {}
+
+		for symbol, data in feeds.items():
+			data = data.set_index("datetime") if "datetime" in data.columns else data
+
+			if not is_datetime64_any_dtype(data.index):
+				raise Exception(f"Feed '{symbol}' must be indexed by 'datetime' as Pandas Timestamp")
+
+			frames[symbol] = data
+
+		self.__symbols = list(frames.keys())
+		self.__fields = fields if fields is not None else [c for c in frames[self.__symbols[0]].columns if c in set.intersection(*[set(f.columns) for f in frames.values()])]
+		self.__symbol_positions = {s: i for i, s in enumerate(self.__symbols)}
+		self.__field_positions = {f: i for i, f in enumerate(self.__fields)}
+
+		# Feeds are aligned once on the union of their timestamps, every bar is then a plain index into the arrays.
+		index = frames[self.__symbols[0]].index
+
+		for symbol in self.__symbols[1:]:
+			index = index.union(frames[symbol].index)
+
+		self.__datetimes = pd.DatetimeIndex(index.unique().sort_values(), name="datetime")
+		self.__values = np.full((len(self.__symbols), len(self.__fields), len(self.__datetimes)), np.nan)
+		self.__available = np.zeros((len(self.__symbols), len(self.__datetimes)), dtype=bool)
+
+		for s, symbol in enumerate(self.__symbols):
+			data = frames[symbol]
+			positions = self.__datetimes.get_indexer(data.index)
+			self.__available[s, positions] = True
+
+			for f, field in enumerate(self.__fields):
+				self.__values[s, f, positions] = data[field].to_numpy(dtype=np.float64)
+
+		# Gaps keep the previous bar's values so open positions can still be marked to market.
+		if fill:
+			last = np.where(self.__available, np.arange(len(self.__datetimes)), 0)
+			np.maximum.accumulate(last, axis=1, out=last)
+
+			for s in range(len(self.__symbols)):
+				self.__values[s] = self.__values[s][:, last[s]]
+
+	@property
+	def symbols(self) -> list[str]:
+		return self.__symbols
+
+	@property
+	def fields(self) -> list[str]:
+		return self.__fields
+
+	@property
+	def datetimes(self) -> pd.DatetimeIndex:
+		return self.__datetimes
+
+	@property
+	def values(self) -> np.ndarray:
+		return self.__values
+
+	@property
+	def available(self) -> np.ndarray:
+		return self.__available
+
+	@property
+	def length(self) -> int:
+		return len(self.__datetimes)
+
+	def get_symbol_position(self, symbol: str) -> int:
+		if symbol not in self.__symbol_positions:
+			raise Exception(f"Unknown symbol '{symbol}'")
+
+		return self.__symbol_positions[symbol]
+
+	def get_field_position(self, field: str) -> int:
+		if field not in self.__field_positions:
+			raise Exception(f"Unknown field '{field}'")
+
+		return self.__field_positions[field]
+
+	def column(self, field: str) -> np.ndarray:
+		return self.__values[:, self.get_field_position(field), :]
+
+	def to_frame(self, symbol: str) -> pd.DataFrame:
+		values = self.__values[self.get_symbol_position(symbol)]
+		return pd.DataFrame(values.T, columns=self.__fields, index=self.__datetimes)
+
+class PanelBar:
+	def __init__(self, panel: Panel):
+		self.__panel = panel
+		self.__values = panel.values
+		self.__available = panel.available
+		self.__symbols = {s: i for i, s in enumerate(panel.symbols)}
+		self.__fields = {f: i for i, f in enumerate(panel.fields)}
+		datetimes = panel.datetimes.array
+		self.__timestamps = (datetimes.asi8, datetimes.unit, datetimes.tz)
+		self.__datetime = None
+		self.__index = -1
+
+	def _seek(self, index: int):
+		self.__index = index
+		self.__datetime = None
+
+	@property
+	def panel(self) -> Panel:
+		return self.__panel
+
+	@property
+	def index(self) -> int:
+		return self.__index
+
+	@property
+	def length(self) -> int:
+		return self.__panel.length
+
+	@property
+	def symbols(self) -> list[str]:
+		return self.__panel.symbols
+
+	@property
+	def fields(self) -> list[str]:
+		return self.__panel.fields
+
+	@property
+	def datetime(self) -> pd.Timestamp:
+		if self.__datetime is None:
+			values, unit, tz = self.__timestamps
+			self.__datetime = pd.Timestamp(values[self.__index], unit=unit, tz=tz)
+
+		return self.__datetime
+
+	def value(self, symbol: str, field: str = "close") -> float:
+		return self.__values[self.__symbols[symbol], self.__fields[field], self.__index]
+
+	def is_available(self, symbol: str) -> bool:
+		return bool(self.__available[self.__symbols[symbol], self.__index])
+
+	def __getitem__(self, key: str) -> Union[pd.Timestamp, np.ndarray]:
+		if key == "datetime":
+			return self.datetime
+
+		# A field gives the values of all symbols at the current bar.
+		return self.__values[:, self.__fields[key], self.__index]
+
+	def __contains__(self, key: str) -> bool:
+		return key == "datetime" or key in self.__fields
+
+	def __repr__(self) -> str:
+		return f"PanelBar({self.__index}, {self.datetime})"
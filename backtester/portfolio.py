@@ -0,0 +1,247 @@
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+from typing import final
+from typing import Union
+import math
+import numpy as np
+import pandas as pd
+from .backtester import *
+from .panel import *
+from .position import *
+from .reference import *
+from .report import *
+
+# Sections timed by set_profiling, mapped to the attributes they wrap.
+_PROFILE_SECTIONS = {
+	"before_next": "_PortfolioStrategy__before_next",
+	"next": "next",
+	"after_next": "_PortfolioStrategy__after_next",
+	"liquidate": "_PortfolioStrategy__liquidate",
+	"open_long": "open_long",
+	"close_long": "close_long",
+	"open_short": "open_short",
+	"close_short": "close_short"
+}
+
+class PortfolioStrategy(Backtester):
+	def __init__(self):
+		super().__init__()
+		self.__panel = None
+		self.__data = None
+
+		# Only opened positions are kept, keyed by symbol and side, so funding and marking cost nothing for flat symbols.
+		self.__positions = {}
+
+	@final
+	def __before_next(self):
+		for (symbol, side), position in self.__positions.items():
+			if side == POSITION_SIDE_LONG and self.cfg.leverage <= 1:
+				continue
+
+			fee = position.notional * self.cfg.get_funding_rate(symbol)
+			self.broker._sub_cash(fee)
+			self.store._add_transaction([self.__data.datetime, TRANSACTION_TYPE_FUNDING_FEE, fee * -1, symbol])
+
+	@final
+	def __liquidate(self):
+		fields = self.__panel.fields
+
+		for (symbol, side), position in list(self.__positions.items()):
+			if position.leverage <= 1:
+				continue
+
+			# A symbol without a bar in an unfilled panel has no price to be liquidated at.
+			if not self.__data.is_available(symbol):
+				continue
+
+			price = position.liquidation_price
+			below = side == POSITION_SIDE_LONG
+			column = ("low" if below else "high") if "low" in fields and "high" in fields else position.close_price_column
+			value = self.__data.value(symbol, column)
+
+			if math.isnan(value) or ((value > price) if below else (value < price)):
+				continue
+
+			# A bar that gaps through the price fills at its open.
+			open_price = self.__data.value(symbol, "open") if "open" in fields else math.nan
+
+			if not math.isnan(open_price):
+				price = min(price, open_price) if below else max(price, open_price)
+
+			qty = position.size
+			notional = price * qty
+
+			# An isolated position never loses more than its margin.
+			pnl = max(position.get_unrealized_pnl(price), -position.margin)
+			fee = min(notional * self.cfg.liquidation_fee_rate, position.margin + pnl)
+			order_side = ORDER_SIDE_SELL if side == POSITION_SIDE_LONG else ORDER_SIDE_BUY
+			self.broker._add_cash(position.margin + pnl - fee)
+			self.store._add_trade([self.__data.datetime, order_side, qty, price, notional, fee, pnl, symbol])
+			self.store._add_transaction([self.__data.datetime, TRANSACTION_TYPE_REALIZED_PNL, pnl, symbol])
+			self.store._add_transaction([self.__data.datetime, TRANSACTION_TYPE_LIQUIDATION_FEE, fee * -1, symbol])
+			del self.__positions[(symbol, side)]
+
+	@final
+	def __get_equity(self) -> float:
+		amount = self.broker.cash
+
+		for (symbol, _), position in self.__positions.items():
+			amount += position.margin + position.get_unrealized_pnl(self.__data.value(symbol, position.close_price_column))
+
+		return amount
+
+	@final
+	def __after_next(self):
+		self.store._add_portfolio_history([self.__data.datetime, self.__get_equity()])
+
+	def set_data(self, data: Union[Panel, dict]):
+		self.__panel = data if isinstance(data, Panel) else Panel(data)
+		super().set_data(pd.DataFrame({"datetime": self.__panel.datetimes}))
+		self.store._set_symbols(self.__panel.symbols)
+
+	@property
+	def panel(self) -> Union[Panel, None]:
+		return self.__panel
+
+	@property
+	def data(self) -> Union[PanelBar, None]:
+		return self.__data
+
+	@property
+	def positions(self) -> dict:
+		return dict(self.__positions)
+
+	def long(self, symbol: str) -> Union[Position, None]:
+		return self.__positions.get((symbol, POSITION_SIDE_LONG))
+
+	def short(self, symbol: str) -> Union[Position, None]:
+		return self.__positions.get((symbol, POSITION_SIDE_SHORT))
+
+	def has_long(self, symbol: str) -> bool:
+		return (symbol, POSITION_SIDE_LONG) in self.__positions
+
+	def has_short(self, symbol: str) -> bool:
+		return (symbol, POSITION_SIDE_SHORT) in self.__positions
+
+	@final
+	def __open(self, symbol: str, side: str, order_side: str, quantity: float, price: float, close_price_column: str):
+		if math.isnan(quantity) or quantity <= 0:
+			raise Exception("Quantity must be greater zero")
+
+		entry_price = price if price > 0 else self.__data.value(symbol, close_price_column)
+
+		if math.isnan(entry_price):
+			raise Exception(f"No price for '{symbol}'")
+
+		notional = entry_price * quantity
+		fee = notional * self.cfg.fee_rate
+		position = self.__positions.get((symbol, side))
+
+		if position is not None:
+			margin = notional * (1 / position.leverage)
+
+			if self.broker.cash < margin + fee:
+				raise Exception("Insufficient funds")
+
+			position._increase(entry_price, quantity)
+			self.broker._sub_cash(margin + fee)
+		else:
+			margin = notional * (1 / self.cfg.leverage)
+
+			if self.broker.cash < margin + fee:
+				raise Exception("Insufficient funds")
+
+			self.__positions[(symbol, side)] = Position(
+				side=side,
+				price=entry_price,
+				size=quantity,
+				created_at=self.__data.datetime,
+				leverage=self.cfg.leverage,
+				close_price_column=close_price_column
+			)
+
+			self.broker._sub_cash(margin + fee)
+
+		self.store._add_trade([self.__data.datetime, order_side, quantity, entry_price, notional, fee, math.nan, symbol])
+		self.store._add_transaction([self.__data.datetime, TRANSACTION_TYPE_COMMISSION, fee * -1, symbol])
+
+	@final
+	def __close(self, symbol: str, side: str, order_side: str, quantity: float, price: float):
+		position = self.__positions.get((symbol, side))
+
+		if position is None:
+			raise Exception(f"No opened {side} positions for '{symbol}'")
+
+		if quantity < 0:
+			raise Exception("Quantity must be greater zero")
+
+		exit_price = price if price > 0 else self.__data.value(symbol, position.close_price_column)
+		qty = position.size if quantity == 0 or quantity >= position.size else quantity
+		pnl = (exit_price - position.price) * qty if side == POSITION_SIDE_LONG else (position.price - exit_price) * qty
+		notional = exit_price * qty
+		fee = notional * self.cfg.fee_rate
+		margin = (position.price * qty) * (1 / position.leverage)
+		self.broker._add_cash(margin + pnl - fee)
+		position._decrease(qty)
+		self.store._add_trade([self.__data.datetime, order_side, qty, exit_price, notional, fee, pnl, symbol])
+		self.store._add_transaction([self.__data.datetime, TRANSACTION_TYPE_REALIZED_PNL, pnl, symbol])
+		self.store._add_transaction([self.__data.datetime, TRANSACTION_TYPE_COMMISSION, fee * -1, symbol])
+
+		if position.size <= 0:
+			del self.__positions[(symbol, side)]
+
+	@final
+	def open_long(self, symbol: str, quantity: float, price: float = 0, close_price_column: str = "close"):
+		self.__open(symbol, POSITION_SIDE_LONG, ORDER_SIDE_BUY, quantity, price, close_price_column)
+
+	@final
+	def close_long(self, symbol: str, quantity: float = 0, price: float = 0):
+		self.__close(symbol, POSITION_SIDE_LONG, ORDER_SIDE_SELL, quantity, price)
+
+	@final
+	def open_short(self, symbol: str, quantity: float, price: float = 0, close_price_column: str = "close"):
+		self.__open(symbol, POSITION_SIDE_SHORT, ORDER_SIDE_SELL, quantity, price, close_price_column)
+
+	@final
+	def close_short(self, symbol: str, quantity: float = 0, price: float = 0):
+		self.__close(symbol, POSITION_SIDE_SHORT, ORDER_SIDE_BUY, quantity, price)
+
+	def next(self):
+		pass
+
+	@final
+	def run(self) -> Union[Report, MetricsReport]:
+		if self.__panel is None:
+			raise Exception("Data feed is empty")
+
+		self._check_data()
+		self._start_metrics()
+		self._start_profile(_PROFILE_SECTIONS)
+		self.__data = PanelBar(self.__panel)
+
+		datetimes = self.__panel.datetimes
+		funding = self._get_funding_mask(datetimes).tolist()
+		snapshots = self._get_snapshot_mask(datetimes).tolist()
+		equity = np.full(self.__data.length, np.nan) if self.cfg.equity_curve else None
+		liquidation = self.cfg.liquidation and self.cfg.leverage > 1
+
+		for i in range(self.__data.length):
+			self.__data._seek(i)
+
+			if funding[i]:
+				self.__before_next()
+
+			if liquidation and len(self.__positions) > 0:
+				self.__liquidate()
+
+			self.next()
+
+			if snapshots[i]:
+				self.__after_next()
+
+			if equity is not None:
+				equity[i] = self.__get_equity()
+
+		if equity is not None:
+			self._extend_equity_curve(datetimes, equity)
+
+		return self._get_report(self.__data.length)
@@ -1,4 +1,5 @@
 from __future__ import (absolute_import, division, print_function, unicode_literals)
+from typing import Union
 import pandas as pd
 from .reference import *
 from . import utils
@@ -11,6 +12,8 @@ class Position:
 		self.__created_at = created_at
 		self.__leverage = leverage
 		self.__close_price_column = close_price_column
+		self.__stop_loss = None
+		self.__take_profit = None
 
 	def _increase(self, price: float, size: float):
 		self.__price = (self.notional + (price * size)) / (self.__size + size)
@@ -19,6 +22,12 @@ class Position:
 	def _decrease(self, size: float):
 		self.__size -= size
 
+	def _set_stop_loss(self, price: Union[float, None]):
+		self.__stop_loss = price
+
+	def _set_take_profit(self, price: Union[float, None]):
+		self.__take_profit = price
+
 	@property
 	def side(self) -> str:
 		return self.__side
@@ -55,6 +64,14 @@ class Position:
 	def close_price_column(self) -> str:
 		return self.__close_price_column
 
+	@property
+	def stop_loss(self) -> Union[float, None]:
+		return self.__stop_loss
+
+	@property
+	def take_profit(self) -> Union[float, None]:
+		return self.__take_profit
+
 	def get_breakeven_price(self, fee_rate: float) -> float:
 		return utils.get_breakeven_price(self.__side, self.__price, self.__size, fee_rate)
 
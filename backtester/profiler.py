@@ -0,0 +1,79 @@
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+from typing import Callable
+import time
+import pandas as pd
+
+class Profiler:
+	def __init__(self):
+		self.__sections = {}
+		self.__nested = 0.0
+		self.__started_at = None
+		self.__elapsed = 0.0
+		self.__bars = 0
+		self.__journals = {}
+
+	@property
+	def elapsed(self) -> float:
+		return self.__elapsed
+
+	@property
+	def bars(self) -> int:
+		return self.__bars
+
+	@property
+	def bars_per_second(self) -> float:
+		return self.__bars / self.__elapsed if self.__elapsed > 0 else float("nan")
+
+	@property
+	def journals(self) -> pd.DataFrame:
+		rows = [[name, start, end, end - start, (end - start) * 1000 / self.__bars if self.__bars > 0 else float("nan")] for name, (start, end) in self.__journals.items()]
+		return pd.DataFrame(rows, columns=["journal", "start_rows", "end_rows", "added_rows", "rows_per_1k_bars"])
+
+	def wrap(self, name: str, fn: Callable) -> Callable:
+		stats = self.__sections.setdefault(name, [0, 0.0, 0.0])
+
+		# Time spent in wrapped calls made from inside fn is counted once, as self time of the innermost section.
+		def timed(*args, **kwargs):
+			nested, self.__nested = self.__nested, 0.0
+			start = time.perf_counter()
+
+			try:
+				return fn(*args, **kwargs)
+			finally:
+				elapsed = time.perf_counter() - start
+				stats[0] += 1
+				stats[1] += elapsed
+				stats[2] += elapsed - self.__nested
+				self.__nested = nested + elapsed
+
+		return timed
+
+	def _start(self, journals: dict):
+		self.__journals = {name: (len(journal), len(journal)) for name, journal in journals.items()}
+		self.__started_at = time.perf_counter()
+
+	def _stop(self, journals: dict, bars: int):
+		self.__elapsed += time.perf_counter() - self.__started_at
+		self.__bars += bars
+		self.__journals = {name: (self.__journals[name][0], len(journal)) for name, journal in journals.items()}
+
+	def _add(self, name: str, elapsed: float):
+		stats = self.__sections.setdefault(name, [0, 0.0, 0.0])
+		stats[0] += 1
+		stats[1] += elapsed
+		stats[2] += elapsed
+
+	def to_frame(self) -> pd.DataFrame:
+		rows = [[name, calls, total, own] for name, (calls, total, own) in self.__sections.items()]
+
+		# Whatever the run loop spent outside the wrapped sections is the engine's own overhead.
+		engine = self.__elapsed - sum(own for name, (_, _, own) in self.__sections.items() if name != "report")
+		rows.append(["engine", self.__bars, engine, engine])
+
+		data = pd.DataFrame(rows, columns=["section", "calls", "total_time", "self_time"])
+		data["time_per_call"] = data["total_time"] / data["calls"].where(data["calls"] > 0)
+		data["share"] = data["self_time"] / self.__elapsed if self.__elapsed > 0 else float("nan")
+		return data
+
+	def __repr__(self) -> str:
+		return f"Profiler({self.__bars} bars, {self.__elapsed:.3f}s, {self.bars_per_second:.0f} bars/s)"
@@ -5,6 +5,12 @@ POSITION_SIDE_LONG: Final[str] = "LONG"
 POSITION_SIDE_SHORT: Final[str] = "SHORT"
 ORDER_SIDE_BUY: Final[str] = "BUY"
 ORDER_SIDE_SELL: Final[str] = "SELL"
+ORDER_TYPE_LIMIT: Final[str] = "LIMIT"
+ORDER_TYPE_STOP_LOSS: Final[str] = "STOP_LOSS"
+ORDER_TYPE_TAKE_PROFIT: Final[str] = "TAKE_PROFIT"
+ORDER_TYPE_LIQUIDATION: Final[str] = "LIQUIDATION"
 TRANSACTION_TYPE_REALIZED_PNL: Final[str] = "REALIZED_PNL"
 TRANSACTION_TYPE_COMMISSION: Final[str] = "COMMISSION"
 TRANSACTION_TYPE_FUNDING_FEE: Final[str] = "FUNDING_FEE"
+TRANSACTION_TYPE_LIQUIDATION_FEE: Final[str] = "LIQUIDATION_FEE"
+TIMEFRAMES: Final[list[str]] = ["1m", "5m", "15m", "30m", "1h", "2h", "3h", "4h", "6h", "12h", "1D", "1W"]
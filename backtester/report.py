@@ -1,37 +1,43 @@
 from __future__ import (absolute_import, division, print_function, unicode_literals)
+from typing import Union
+from functools import cached_property
+import numpy as np
 import pandas as pd
 from . import store
 from . import config
 from .reference import *
 from .broker import *
+from .profiler import *
+from .drawdown import *
 
 class Report(object):
 	def __init__(self, strategy: str, broker: Broker, cfg: config.Config, store: store.Store):
 		self.__strategy = strategy
-		self.__start_datetime = store.data.iloc[0].datetime
-		self.__end_datetime = store.data.iloc[-1].datetime
+		self.__start_datetime = store.start_datetime
+		self.__end_datetime = store.end_datetime
 		self.__broker = broker
+		self.__config = cfg
+		self.__data = store.data
 
-		self.__trades = pd.DataFrame(
-			store.trades,
-			columns=["datetime", "side", "quantity", "price", "notional", "fee", "realized_pnl"]
-		).round({
-			"quantity": cfg.base_precision,
-			"price": cfg.price_precision,
-			"notional": cfg.quote_precision,
-			"fee": cfg.quote_precision,
-			"realized_pnl": cfg.quote_precision
-		})
-
-		self.__transactions = pd.DataFrame(
-			store.transactions,
-			columns=["datetime", "type", "amount"]
-		).round({"amount": cfg.quote_precision})
+		# Journal frames are zero-copy views, rounding and every metric below happen on first access.
+		self.__raw_trades = store.trades.to_frame()
+		self.__raw_transactions = store.transactions.to_frame()
+		self.__raw_portfolio_history = store.portfolio_history.to_frame()
+		self.__raw_equity_curve = store.equity_curve.to_frame()
+		self.__equity_drawdown = store.equity_drawdown
+		self.__profile = None
 
 	@property
 	def strategy(self) -> str:
 		return self.__strategy
 
+	@property
+	def profile(self) -> Union[Profiler, None]:
+		return self.__profile
+
+	def _set_profile(self, profiler: Profiler):
+		self.__profile = profiler
+
 	@property
 	def start_datetime(self) -> pd.Timestamp:
 		return self.__start_datetime
@@ -44,22 +50,234 @@ class Report(object):
 	def start_cash(self) -> float:
 		return self.__broker.start_cash
 
-	@property
+	@cached_property
 	def trades(self) -> pd.DataFrame:
-		return self.__trades
+		return self.__raw_trades.round({
+			"quantity": self.__config.base_precision,
+			"price": self.__config.price_precision,
+			"notional": self.__config.quote_precision,
+			"fee": self.__config.quote_precision,
+			"realized_pnl": self.__config.quote_precision
+		})
 
-	@property
+	@cached_property
 	def transactions(self) -> pd.DataFrame:
-		return self.__transactions
+		return self.__raw_transactions.round({"amount": self.__config.quote_precision})
 
-	@property
-	def returns(self) -> pd.DataFrame:
+	@cached_property
+	def portfolio_history(self) -> pd.DataFrame:
+		return self.__raw_portfolio_history.round({"amount": self.__config.quote_precision})
+
+	@cached_property
+	def equity_curve(self) -> pd.DataFrame:
+		return self.__raw_equity_curve.round({"amount": self.__config.quote_precision, "high": self.__config.quote_precision, "low": self.__config.quote_precision})
+
+	@cached_property
+	def __realized(self) -> pd.DataFrame:
 		start_datetime = self.__start_datetime - pd.DateOffset(days=1)
-		data = self.__transactions[["datetime", "amount"]].copy()
+		data = self.transactions[["datetime", "amount"]].copy()
 		data.loc[-1] = [start_datetime, self.__broker.start_cash]
 		data.index = data.index + 1
 		data.sort_index(ascending=True, inplace=True)
 		data = data.groupby(pd.Grouper(key="datetime", freq="D"), dropna=False).sum(min_count=1)
 		data["amount"] = data["amount"].rolling(min_periods=1, window=len(data.index)).sum()
+		return data
+
+	@cached_property
+	def __returns(self) -> pd.DataFrame:
+		data = self.__realized.copy()
 		data["percent"] = data["amount"].pct_change(periods=1)
 		return data.iloc[1:, :].reset_index()
+
+	@property
+	def returns(self) -> pd.DataFrame:
+		# Callers get their own frame, the cached one stays untouched.
+		return self.__returns.copy()
+
+	@cached_property
+	def __daily_return(self) -> pd.Series:
+		return self.__realized["amount"].pct_change(periods=1)
+
+	@cached_property
+	def sharpe_ratio(self) -> float:
+		daily_return = self.__daily_return
+		return (len(daily_return) ** 0.5) * (daily_return.mean() / daily_return.std())
+
+	@cached_property
+	def daily_return(self) -> float:
+		return self.__daily_return.mean()
+
+	@cached_property
+	def weekly_return(self) -> float:
+		return self.__realized["amount"].pct_change(periods=7).mean()
+
+	@cached_property
+	def monthly_return(self) -> float:
+		return self.__realized["amount"].pct_change(periods=30).mean()
+
+	@cached_property
+	def annual_return(self) -> float:
+		return self.__realized["amount"].pct_change(periods=365).mean()
+
+	@cached_property
+	def end_cash(self) -> float:
+		return self.__realized["amount"].iloc[-1]
+
+	@cached_property
+	def cumulative_return(self) -> float:
+		return self.end_cash - self.__broker.start_cash
+
+	@cached_property
+	def cumulative_return_pct(self) -> float:
+		return (self.cumulative_return / self.__broker.start_cash) * 100
+
+	@cached_property
+	def __equity(self) -> tuple[pd.Series, pd.Series]:
+		# The recorded mark-to-market curve shows intraday drawdowns the daily realized balance can't.
+		if len(self.__raw_equity_curve.index) > 0:
+			data = self.equity_curve.set_index("datetime")
+			return data["low"].rename("amount"), data["high"].rename("amount")
+
+		return self.__realized["amount"], self.__realized["amount"]
+
+	@cached_property
+	def drawdown_history(self) -> pd.DataFrame:
+		equity, highs = self.__equity
+		data = pd.DataFrame({"amount": equity})
+		data["drawdown_pct"] = get_drawdown(equity.to_numpy(), highs.to_numpy()) * 100
+		return data.reset_index()
+
+	@cached_property
+	def drawdowns(self) -> pd.DataFrame:
+		equity, highs = self.__equity
+		return get_drawdown_periods(equity.to_numpy(), equity.index, highs.to_numpy())
+
+	@cached_property
+	def __max_drawdown(self) -> tuple[float, float]:
+		# The curve may be downsampled, its max drawdown was taken from every bar while it was recorded.
+		if len(self.__raw_equity_curve.index) > 0:
+			return self.__equity_drawdown
+
+		return get_max_drawdown(self.__equity[0].to_numpy())[:2]
+
+	@cached_property
+	def max_drawdown(self) -> float:
+		return self.__max_drawdown[1]
+
+	@cached_property
+	def max_drawdown_pct(self) -> float:
+		return self.__max_drawdown[0] * 100
+
+	@cached_property
+	def total_fees(self) -> float:
+		fee_types = [TRANSACTION_TYPE_COMMISSION, TRANSACTION_TYPE_FUNDING_FEE, TRANSACTION_TYPE_LIQUIDATION_FEE]
+		return self.transactions.loc[self.transactions["type"].isin(fee_types), "amount"].sum()
+
+	@cached_property
+	def realized_pnl(self) -> float:
+		return self.trades["realized_pnl"].sum()
+
+	@cached_property
+	def turnover(self) -> float:
+		return self.trades["notional"].sum()
+
+	@cached_property
+	def trades_qty(self) -> float:
+		return len(self.trades.index) / 2
+
+	@cached_property
+	def win_ratio(self) -> float:
+		return self.__win_loss_ratio[0]
+
+	@cached_property
+	def loss_ratio(self) -> float:
+		return self.__win_loss_ratio[1]
+
+	@cached_property
+	def __win_loss_ratio(self) -> tuple[float, float]:
+		pnls = self.transactions.loc[self.transactions["type"] == TRANSACTION_TYPE_REALIZED_PNL]
+		win_qty = len(pnls.loc[pnls["amount"] > 0].index)
+		loss_qty = len(pnls.loc[pnls["amount"] < 0].index)
+		win_ratio = 0
+		loss_ratio = 0
+
+		if len(pnls.index) > 0:
+			win_ratio = win_qty / len(pnls.index) * 100
+			loss_ratio = loss_qty / len(pnls.index) * 100
+
+		return win_ratio, loss_ratio
+
+	@cached_property
+	def long_ratio(self) -> float:
+		return self.__long_short_ratio[0]
+
+	@cached_property
+	def short_ratio(self) -> float:
+		return self.__long_short_ratio[1]
+
+	@cached_property
+	def __long_short_ratio(self) -> tuple[float, float]:
+		positions = self.trades.loc[self.trades["realized_pnl"].isna()]
+		long_qty = len(positions.loc[positions["side"] == ORDER_SIDE_BUY].index)
+		short_qty = len(positions.loc[positions["side"] == ORDER_SIDE_SELL].index)
+		long_ratio = 0
+		short_ratio = 0
+
+		if len(positions.index) > 0:
+			long_ratio = long_qty / len(positions.index) * 100
+			short_ratio = short_qty / len(positions.index) * 100
+
+		return long_ratio, short_ratio
+
+	def __period_returns(self, freq: str) -> pd.DataFrame:
+		start_datetime = self.__start_datetime - pd.DateOffset(months=1)
+		data = self.transactions[["datetime", "amount"]].copy()
+		data.loc[-1] = [start_datetime, self.__broker.start_cash]
+		data.index = data.index + 1
+		data.sort_index(ascending=True, inplace=True)
+		data = data.groupby(pd.Grouper(key="datetime", freq=freq), dropna=False).sum(min_count=1)
+		data["amount"] = data["amount"].rolling(min_periods=1, window=len(data.index)).sum()
+		data["pct_diff"] = data["amount"].pct_change() * 100
+		return data.iloc[1:, :].reset_index()
+
+	@cached_property
+	def monthly_returns(self) -> pd.DataFrame:
+		data = self.__period_returns("ME")
+		data["month"] = data["datetime"].dt.strftime("%b")
+		data["year"] = data["datetime"].dt.year
+		return data
+
+	@cached_property
+	def annual_returns(self) -> pd.DataFrame:
+		data = self.__period_returns("YE")
+		data["year"] = data["datetime"].dt.year
+		return data
+
+	@cached_property
+	def benchmark_return(self) -> float:
+		if not all(x in self.__data.columns for x in ["open", "high", "low", "close"]):
+			return np.nan
+
+		bench = self.__data.set_index("datetime").resample("D").agg({
+			"open": "first",
+			"high": "max",
+			"low": "min",
+			"close": "last"
+		})
+
+		avg_price = (bench[["open", "high", "low", "close"]].sum(axis=1) / 4).replace(0, np.nan)
+		balance = self.__broker.start_cash * (avg_price / avg_price.shift(1)).cumprod()
+		return balance.iloc[-1] - self.__broker.start_cash
+
+	@cached_property
+	def trades_interval(self) -> pd.DataFrame:
+		data = self.trades.loc[self.trades["realized_pnl"].isna(), ["datetime", "realized_pnl"]]
+		data = data.reset_index(drop=True)
+		data["datetime_delta"] = data["datetime"].diff()
+		return data
+
+	@cached_property
+	def trade_duration(self) -> pd.DataFrame:
+		data = self.trades[["datetime", "realized_pnl"]].copy()
+		data["datetime_delta"] = data["datetime"].diff()
+		return data.loc[data["realized_pnl"].notna()].reset_index(drop=True)
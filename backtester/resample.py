@@ -0,0 +1,144 @@
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+from typing import Union
+import numpy as np
+import pandas as pd
+from .cache import *
+from .reference import *
+from . import utils
+
+_AGGREGATIONS = {
+	"open": "first",
+	"high": "max",
+	"low": "min",
+	"close": "last",
+	"volume": "sum"
+}
+
+def _reduce(how: str, values: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+	if how == "first":
+		return values[starts]
+	elif how == "last":
+		return values[ends - 1]
+	elif how == "max":
+		return np.maximum.reduceat(values, starts)
+	elif how == "min":
+		return np.minimum.reduceat(values, starts)
+	elif how == "sum":
+		return np.add.reduceat(values, starts)
+
+	raise Exception(f"Unknown aggregation '{how}'")
+
+def _aggregate(datetimes: np.ndarray, columns: dict, timeframe: str) -> tuple[np.ndarray, dict]:
+	delta = utils.get_timeframe_timedelta(timeframe).value
+	keys = ((datetimes - utils.TIMEFRAME_ORIGIN) // delta) * delta + utils.TIMEFRAME_ORIGIN
+	starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]]) if len(keys) > 0 else np.array([], dtype=np.int64)
+	ends = np.r_[starts[1:], len(keys)]
+
+	if len(starts) == 0:
+		return keys, {c: v[:0] for c, v in columns.items()}
+
+	return keys[starts], {c: _reduce(_AGGREGATIONS.get(c, "last"), v, starts, ends) for c, v in columns.items()}
+
+def _source_timeframe(timeframe: str, available: list[str]) -> Union[str, None]:
+	delta = utils.get_timeframe_timedelta(timeframe).value
+	source = None
+
+	for tf in available:
+		tf_delta = utils.get_timeframe_timedelta(tf).value
+
+		if tf_delta < delta and delta % tf_delta == 0:
+			if source is None or tf_delta > utils.get_timeframe_timedelta(source).value:
+				source = tf
+
+	return source
+
+def _split(data: pd.DataFrame) -> tuple[np.ndarray, dict, object]:
+	if "datetime" in data.columns:
+		data = data.set_index("datetime")
+
+	index = pd.DatetimeIndex(data.index)
+	datetimes = (index.tz_convert(None) if index.tz is not None else index).as_unit("ns").asi8
+	return datetimes, {c: data[c].to_numpy() for c in data.columns}, index.tz
+
+def _join(datetimes: np.ndarray, columns: dict, tz) -> pd.DataFrame:
+	index = pd.DatetimeIndex(datetimes.view("datetime64[ns]"), name="datetime")
+	index = index.tz_localize("UTC").tz_convert(tz) if tz is not None else index
+	return pd.DataFrame(columns, index=index)
+
+class Resampler:
+	def __init__(self, max_items: int = 64, path: Union[str, None] = None, max_bytes: Union[int, None] = None):
+		self.__memory = MemoryCache(max_items=max_items)
+		self.__disk = DiskCache(path, max_bytes=max_bytes) if path is not None else None
+
+	def __get(self, key: str, tz) -> Union[pd.DataFrame, None]:
+		data = self.__memory.get(key)
+
+		if data is None and self.__disk is not None:
+			arrays = self.__disk.get(key)
+
+			if arrays is not None:
+				datetimes = np.asarray(arrays.pop("__datetime__"))
+				names = [str(x) for x in np.asarray(arrays.pop("__columns__"))]
+				data = _join(datetimes, {c: np.asarray(arrays[c]) for c in names}, tz)
+				self.__memory.set(key, data)
+
+		return data
+
+	def __set(self, key: str, data: pd.DataFrame, datetimes: np.ndarray, columns: dict):
+		self.__memory.set(key, data)
+
+		if self.__disk is not None:
+			arrays = {c: v for c, v in columns.items()}
+			arrays["__datetime__"] = datetimes
+			arrays["__columns__"] = np.array(list(columns.keys()))
+			self.__disk.set(key, arrays)
+
+	def resample(self, data: pd.DataFrame, timeframe: str, base: str = "1m") -> pd.DataFrame:
+		return self.resample_all(data, [timeframe], base=base)[timeframe]
+
+	def resample_all(self, data: pd.DataFrame, timeframes: Union[list[str], None] = None, base: str = "1m") -> dict:
+		datetimes, columns, tz = _split(data)
+		data_key = fingerprint(datetimes, list(columns.keys()), *columns.values())
+		base_delta = utils.get_timeframe_timedelta(base).value
+		timeframes = timeframes if timeframes is not None else [tf for tf in TIMEFRAMES if utils.get_timeframe_timedelta(tf).value > base_delta]
+		results = {}
+		built = {base: (datetimes, columns)}
+
+		for tf in timeframes:
+			if tf not in TIMEFRAMES:
+				raise Exception(f"Unknown timeframe '{tf}'")
+
+		# Each timeframe is aggregated from the largest finer one already built, so the base data is scanned once.
+		for tf in sorted(set(timeframes), key=lambda x: utils.get_timeframe_timedelta(x).value):
+			key = f"{data_key}-{tf}"
+			cached = self.__get(key, tz)
+
+			if cached is not None:
+				built[tf] = _split(cached)[:2]
+				results[tf] = cached
+				continue
+
+			if tf == base:
+				results[tf] = _join(datetimes, columns, tz)
+				continue
+
+			source = _source_timeframe(tf, list(built.keys()))
+
+			if source is None:
+				raise Exception(f"Timeframe '{tf}' can't be built from '{base}' data")
+
+			tf_datetimes, tf_columns = _aggregate(*built[source], tf)
+			built[tf] = (tf_datetimes, tf_columns)
+			results[tf] = _join(tf_datetimes, tf_columns, tz)
+			self.__set(key, results[tf], tf_datetimes, tf_columns)
+
+		# Cached frames are shared by every later hit, callers get their own copy to modify.
+		return {tf: results[tf].copy() for tf in timeframes}
+
+	def clear(self):
+		self.__memory.clear()
+
+		if self.__disk is not None:
+			self.__disk.clear()
+
+resampler = Resampler()
@@ -0,0 +1,97 @@
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+from multiprocessing.shared_memory import SharedMemory
+from typing import Union
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_datetime64_any_dtype, is_numeric_dtype
+
+class SharedData:
+	def __init__(self, data: pd.DataFrame, columns: Union[list[str], None] = None):
+		if "datetime" not in data.columns:
+			data = data.reset_index()
+
+		if "datetime" not in data.columns or not is_datetime64_any_dtype(data["datetime"]):
+			raise Exception("Data feed must have column 'datetime' as Pandas Timestamp")
+
+		columns = columns if columns is not None else [c for c in data.columns if c != "datetime"]
+
+		for column in columns:
+			if not is_numeric_dtype(data[column]):
+				raise Exception(f"Column '{column}' must be numeric to be shared")
+
+		self.__columns = list(columns)
+		self.__length = len(data.index)
+		self.__tz = data["datetime"].dt.tz
+		self.__owner = True
+		self.__data = None
+		self.__shm = SharedMemory(create=True, size=max(self.__nbytes(), 1))
+
+		datetimes, values = self.__arrays()
+		datetimes[:] = data["datetime"].dt.as_unit("ns").array.asi8
+
+		for i, column in enumerate(self.__columns):
+			values[i] = data[column].to_numpy(dtype=np.float64)
+
+	def __getstate__(self) -> dict:
+		return {
+			"name": self.__shm.name,
+			"columns": self.__columns,
+			"length": self.__length,
+			"tz": self.__tz
+		}
+
+	def __setstate__(self, state: dict):
+		self.__columns = state["columns"]
+		self.__length = state["length"]
+		self.__tz = state["tz"]
+		self.__owner = False
+		self.__data = None
+		self.__shm = SharedMemory(name=state["name"])
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		self.unlink()
+		self.close()
+
+	def __nbytes(self) -> int:
+		return 8 * self.__length * (len(self.__columns) + 1)
+
+	def __arrays(self) -> tuple[np.ndarray, np.ndarray]:
+		buffer = np.ndarray((self.__nbytes(),), dtype=np.uint8, buffer=self.__shm.buf)
+		datetimes = buffer[:8 * self.__length].view(np.int64)
+		values = buffer[8 * self.__length:].view(np.float64).reshape(len(self.__columns), self.__length)
+		return datetimes, values
+
+	@property
+	def name(self) -> str:
+		return self.__shm.name
+
+	@property
+	def columns(self) -> list[str]:
+		return self.__columns
+
+	@property
+	def data(self) -> pd.DataFrame:
+		if self.__data is None:
+			datetimes, values = self.__arrays()
+			index = pd.DatetimeIndex(datetimes, dtype=pd.DatetimeTZDtype("ns", self.__tz) if self.__tz is not None else "datetime64[ns]", copy=False)
+			data = pd.DataFrame(values.T, columns=self.__columns, copy=False)
+			data.insert(0, "datetime", pd.Series(index.array, copy=False))
+			self.__data = data
+
+		return self.__data
+
+	def close(self):
+		self.__data = None
+
+		try:
+			self.__shm.close()
+		except BufferError:
+			# Frames returned by data still reference the buffer, the mapping is released together with them.
+			pass
+
+	def unlink(self):
+		if self.__owner:
+			self.__shm.unlink()
@@ -1,13 +1,60 @@
 from __future__ import (absolute_import, division, print_function, unicode_literals)
+from typing import Union
+import numpy as np
 import pandas as pd
+from .journal import *
+from .metrics import *
+from .metrics import _Drawdown
 from .reference import *
 
+_TRANSACTION_COLUMNS = [
+	("datetime", "datetime"),
+	("type", [TRANSACTION_TYPE_REALIZED_PNL, TRANSACTION_TYPE_COMMISSION, TRANSACTION_TYPE_FUNDING_FEE, TRANSACTION_TYPE_LIQUIDATION_FEE]),
+	("amount", "float")
+]
+
+_TRADE_COLUMNS = [
+	("datetime", "datetime"),
+	("side", [ORDER_SIDE_BUY, ORDER_SIDE_SELL]),
+	("quantity", "float"),
+	("price", "float"),
+	("notional", "float"),
+	("fee", "float"),
+	("realized_pnl", "float")
+]
+
 class Store:
 	def __init__(self):
 		self.__data = None
-		self.__portfolio_history = []
-		self.__transaction_history = []
-		self.__trade_history = []
+		self.__start_datetime = None
+		self.__end_datetime = None
+		self.__metrics = None
+
+		self.__portfolio_history = Journal([
+			("datetime", "datetime"),
+			("amount", "float")
+		])
+
+		self.__equity_curve = Journal([
+			("datetime", "datetime"),
+			("amount", "float"),
+			("high", "float"),
+			("low", "float")
+		])
+
+		self.__equity_drawdown = _Drawdown()
+
+		self.__transaction_history = Journal(_TRANSACTION_COLUMNS)
+		self.__trade_history = Journal(_TRADE_COLUMNS)
+
+	def __getstate__(self) -> dict:
+		# Checkpoints keep the journals only, the data feed is supplied again through set_data.
+		state = self.__dict__.copy()
+		state["_Store__data"] = None
+		return state
+
+	def __setstate__(self, state: dict):
+		self.__dict__.update(state)
 
 	@property
 	def data(self) -> pd.DataFrame:
@@ -17,23 +64,119 @@ class Store:
 	def data(self, data: pd.DataFrame):
 		self.__data = data
 
+		if data is not None and "datetime" in data.columns:
+			if len(data.index) > 0:
+				self._set_span(data["datetime"].iloc[0], data["datetime"].iloc[-1])
+
+			for journal in [self.__portfolio_history, self.__equity_curve, self.__transaction_history, self.__trade_history]:
+				if len(journal) == 0:
+					journal.tz = data["datetime"].dt.tz
+
+	def _set_symbols(self, symbols: list[str]):
+		# Multi-symbol runs journal the symbol of every trade and transaction as the last column.
+		tz = self.__trade_history.tz
+		self.__transaction_history = Journal(_TRANSACTION_COLUMNS + [("symbol", list(symbols))], tz=tz)
+		self.__trade_history = Journal(_TRADE_COLUMNS + [("symbol", list(symbols))], tz=tz)
+
+	@property
+	def start_datetime(self) -> Union[pd.Timestamp, None]:
+		return self.__start_datetime
+
+	@property
+	def end_datetime(self) -> Union[pd.Timestamp, None]:
+		return self.__end_datetime
+
+	def _set_span(self, start_datetime: pd.Timestamp, end_datetime: pd.Timestamp):
+		self.__start_datetime = start_datetime
+		self.__end_datetime = end_datetime
+
+	@property
+	def metrics(self) -> Union[Metrics, None]:
+		return self.__metrics
+
+	def _set_metrics(self, metrics: Union[Metrics, None]):
+		self.__metrics = metrics
+
 	@property
-	def transactions(self) -> list:
+	def transactions(self) -> Journal:
 		return self.__transaction_history
 
 	def _add_transaction(self, row: list):
+		if self.__metrics is not None:
+			self.__metrics.add_transaction(row)
+			return
+
 		self.__transaction_history.append(row)
 
+	def _extend_transactions(self, columns: dict):
+		if self.__metrics is not None:
+			self.__metrics.extend_transactions(columns)
+			return
+
+		self.__transaction_history.extend(columns)
+
 	@property
-	def trades(self) -> list:
+	def trades(self) -> Journal:
 		return self.__trade_history
 
 	def _add_trade(self, row: list):
+		if self.__metrics is not None:
+			self.__metrics.add_trade(row)
+			return
+
 		self.__trade_history.append(row)
 
+	def _extend_trades(self, columns: dict):
+		if self.__metrics is not None:
+			self.__metrics.extend_trades(columns)
+			return
+
+		self.__trade_history.extend(columns)
+
 	@property
-	def portfolio_history(self) -> list:
+	def portfolio_history(self) -> Journal:
 		return self.__portfolio_history
 
 	def _add_portfolio_history(self, row: list):
+		if self.__metrics is not None:
+			self.__metrics.add_portfolio_history(row)
+			return
+
 		self.__portfolio_history.append(row)
+
+	def _extend_portfolio_history(self, columns: dict):
+		if self.__metrics is not None:
+			self.__metrics.extend_portfolio_history(columns)
+			return
+
+		self.__portfolio_history.extend(columns)
+
+	@property
+	def equity_curve(self) -> Journal:
+		return self.__equity_curve
+
+	@property
+	def equity_drawdown(self) -> tuple[float, float]:
+		return self.__equity_drawdown.max_drawdown, self.__equity_drawdown.max_drawdown_amount
+
+	def _extend_equity_curve(self, columns: dict, equity: np.ndarray):
+		if self.__metrics is not None:
+			self.__metrics.extend_equity_curve(equity)
+			return
+
+		self.__equity_curve.extend(columns)
+		self.__equity_drawdown.extend(equity)
+
+	def _get_equity_curve_mark(self) -> tuple:
+		if self.__metrics is not None:
+			return self.__metrics.get_equity_curve_mark()
+
+		return len(self.__equity_curve), self.__equity_drawdown.copy()
+
+	def _rewind_equity_curve(self, mark: tuple):
+		if self.__metrics is not None:
+			self.__metrics.rewind_equity_curve(mark)
+			return
+
+		self.__equity_curve._truncate(mark[0])
+		self.__equity_drawdown = mark[1].copy()
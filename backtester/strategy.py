@@ -1,14 +1,42 @@
 from __future__ import (absolute_import, division, print_function, unicode_literals)
 from typing import final
-from typing import Union
+from typing import Iterable, Union
 import math
+import numpy as np
+import pandas as pd
 import datetime as dt
-from pandas.api.types import is_datetime64_ns_dtype
 from datetime import timezone
 from .backtester import *
+from .bar import *
 from .position import *
+from .order import *
+from .indicators import *
+from .cache import *
 from .reference import *
 from .report import *
+from . import utils
+
+# Resting orders are searched at most this many bars ahead, the search simply resumes from there.
+_TRIGGER_HORIZON = 1024
+
+# Sections timed by set_profiling, mapped to the attributes they wrap.
+_PROFILE_SECTIONS = {
+	"before_next": "_Strategy__before_next",
+	"next": "next",
+	"after_next": "_Strategy__after_next",
+	"fill_orders": "_Strategy__fill_orders",
+	"update_indicators": "_Strategy__update_indicators",
+	"open_long": "open_long",
+	"close_long": "close_long",
+	"open_short": "open_short",
+	"close_short": "close_short",
+	"open_long_limit": "open_long_limit",
+	"open_short_limit": "open_short_limit",
+	"set_stop_loss": "set_stop_loss",
+	"set_take_profit": "set_take_profit",
+	"cancel_order": "cancel_order",
+	"cancel_orders": "cancel_orders"
+}
 
 class Strategy(Backtester):
 	def __init__(self):
@@ -20,6 +48,18 @@ class Strategy(Backtester):
 			POSITION_SIDE_SHORT: None
 		}
 
+		self.__orders = []
+		self.__trigger = None
+		self.__waiting = False
+		self.__schedules = []
+		self.__indicators = []
+		self.__indicator_index = 0
+		self.__streams = []
+		self.__resumed = None
+		self.__completed = False
+		self.__seeded = False
+		self.__tail = None
+
 	@final
 	def __skip_next(self) -> bool:
 		if self.__data is None:
@@ -29,34 +69,36 @@ class Strategy(Backtester):
 
 	@final
 	def __before_next(self):
-		if self.__data["datetime"].hour in self.cfg.funding_rate_hours and self.__data["datetime"].minute == 0:
-			if self.__positions[POSITION_SIDE_LONG] is not None and self.cfg.leverage > 1:
-				fee = self.__positions[POSITION_SIDE_LONG].notional * self.cfg.funding_rate
-				self.broker._sub_cash(fee)
-				self.store._add_transaction([self.__data["datetime"], TRANSACTION_TYPE_FUNDING_FEE, fee * -1])
+		if self.__positions[POSITION_SIDE_LONG] is not None and self.cfg.leverage > 1:
+			fee = self.__positions[POSITION_SIDE_LONG].notional * self.cfg.funding_rate
+			self.broker._sub_cash(fee)
+			self.store._add_transaction([self.__data["datetime"], TRANSACTION_TYPE_FUNDING_FEE, fee * -1])
 
-			if self.__positions[POSITION_SIDE_SHORT] is not None:
-				fee = self.__positions[POSITION_SIDE_SHORT].notional * self.cfg.funding_rate
-				self.broker._sub_cash(fee)
-				self.store._add_transaction([self.__data["datetime"], TRANSACTION_TYPE_FUNDING_FEE, fee * -1])
+		if self.__positions[POSITION_SIDE_SHORT] is not None:
+			fee = self.__positions[POSITION_SIDE_SHORT].notional * self.cfg.funding_rate
+			self.broker._sub_cash(fee)
+			self.store._add_transaction([self.__data["datetime"], TRANSACTION_TYPE_FUNDING_FEE, fee * -1])
 
 	@final
-	def __after_next(self):
-		if self.__data["datetime"].hour == 0 and self.__data["datetime"].minute == 0:
-			amount = self.broker.cash
+	def __get_equity(self) -> float:
+		amount = self.broker.cash
+
+		if self.__positions[POSITION_SIDE_LONG] is not None:
+			pnl = self.__positions[POSITION_SIDE_LONG].get_unrealized_pnl(self.__data[self.__positions[POSITION_SIDE_LONG].close_price_column])
+			amount += self.__positions[POSITION_SIDE_LONG].margin + pnl
 
-			if self.__positions[POSITION_SIDE_LONG] is not None:
-				pnl = self.__positions[POSITION_SIDE_LONG].get_unrealized_pnl(self.__data[self.__positions[POSITION_SIDE_LONG].close_price_column])
-				amount += self.__positions[POSITION_SIDE_LONG].margin + pnl
+		if self.__positions[POSITION_SIDE_SHORT] is not None:
+			pnl = self.__positions[POSITION_SIDE_SHORT].get_unrealized_pnl(self.__data[self.__positions[POSITION_SIDE_SHORT].close_price_column])
+			amount += self.__positions[POSITION_SIDE_SHORT].margin + pnl
 
-			if self.__positions[POSITION_SIDE_SHORT] is not None:
-				pnl = self.__positions[POSITION_SIDE_SHORT].get_unrealized_pnl(self.__data[self.__positions[POSITION_SIDE_SHORT].close_price_column])
-				amount += self.__positions[POSITION_SIDE_SHORT].margin + pnl
+		return amount
 
-			self.store._add_portfolio_history([self.__data["datetime"], amount])
+	@final
+	def __after_next(self):
+		self.store._add_portfolio_history([self.__data["datetime"], self.__get_equity()])
 
 	@property
-	def data(self) -> tuple:
+	def data(self) -> Union[Bar, None]:
 		return self.__data
 
 	@property
@@ -112,6 +154,8 @@ class Strategy(Backtester):
 		self.store._add_trade([self.__data["datetime"], ORDER_SIDE_BUY, quantity, entry_price, notional, fee, math.nan])
 		self.store._add_transaction([self.__data["datetime"], TRANSACTION_TYPE_COMMISSION, fee * -1])
 
+		self.__trigger = None
+
 	@final
 	def close_long(self, quantity: float = 0, price: float = 0):
 		if self.__positions[POSITION_SIDE_LONG] is None:
@@ -135,6 +179,8 @@ class Strategy(Backtester):
 		if self.__positions[POSITION_SIDE_LONG].size <= 0:
 			self.__positions[POSITION_SIDE_LONG] = None
 
+		self.__trigger = None
+
 	@final
 	def open_short(self, quantity: float, price: float = 0, close_price_column: str = "close"):
 		if math.isnan(quantity) or quantity <= 0:
@@ -172,6 +218,8 @@ class Strategy(Backtester):
 		self.store._add_trade([self.__data["datetime"], ORDER_SIDE_SELL, quantity, entry_price, notional, fee, math.nan])
 		self.store._add_transaction([self.__data["datetime"], TRANSACTION_TYPE_COMMISSION, fee * -1])
 
+		self.__trigger = None
+
 	@final
 	def close_short(self, quantity: float = 0, price: float = 0):
 		if self.__positions[POSITION_SIDE_SHORT] is None:
@@ -195,33 +243,534 @@ class Strategy(Backtester):
 		if self.__positions[POSITION_SIDE_SHORT].size <= 0:
 			self.__positions[POSITION_SIDE_SHORT] = None
 
+		self.__trigger = None
+
+	@property
+	def orders(self) -> list[Order]:
+		return list(self.__orders)
+
+	@final
+	def __check_trigger_columns(self):
+		if not "high" in self.__data or not "low" in self.__data:
+			raise Exception("Resting orders need 'high' and 'low' columns")
+
+	@final
+	def set_stop_loss(self, side: str, price: Union[float, None]):
+		if self.__positions[side] is None:
+			raise Exception(f"No opened {side} positions")
+
+		self.__check_trigger_columns()
+		self.__positions[side]._set_stop_loss(price)
+		self.__trigger = None
+
+	@final
+	def set_take_profit(self, side: str, price: Union[float, None]):
+		if self.__positions[side] is None:
+			raise Exception(f"No opened {side} positions")
+
+		self.__check_trigger_columns()
+		self.__positions[side]._set_take_profit(price)
+		self.__trigger = None
+
+	@final
+	def __place_order(self, side: str, quantity: float, price: float, close_price_column: str) -> Order:
+		if math.isnan(quantity) or quantity <= 0:
+			raise Exception("Quantity must be greater zero")
+
+		if math.isnan(price) or price <= 0:
+			raise Exception("Price must be greater zero")
+
+		self.__check_trigger_columns()
+		order = Order(ORDER_TYPE_LIMIT, side, price, quantity, self.__data["datetime"], close_price_column)
+		self.__orders.append(order)
+		self.__trigger = None
+		return order
+
+	@final
+	def open_long_limit(self, quantity: float, price: float, close_price_column: str = "close") -> Order:
+		return self.__place_order(POSITION_SIDE_LONG, quantity, price, close_price_column)
+
+	@final
+	def open_short_limit(self, quantity: float, price: float, close_price_column: str = "close") -> Order:
+		return self.__place_order(POSITION_SIDE_SHORT, quantity, price, close_price_column)
+
+	@final
+	def cancel_order(self, order: Order):
+		self.__orders.remove(order)
+		self.__trigger = None
+
+	@final
+	def cancel_orders(self):
+		self.__orders.clear()
+		self.__trigger = None
+
+	@final
+	def wait_for_orders(self):
+		# next() isn't called again until a resting order fills, the engine jumps straight to that bar.
+		if len(self.__get_triggers()) > 0:
+			self.__waiting = True
+
+	@final
+	def schedule(
+		self,
+		timeframe: Union[str, None] = None,
+		hours: Union[list[int], None] = None,
+		minutes: Union[list[int], None] = None,
+		weekdays: Union[list[int], None] = None,
+		column: Union[str, None] = None
+	):
+		if timeframe is not None and timeframe not in TIMEFRAMES:
+			raise Exception(f"Unknown timeframe '{timeframe}'")
+
+		# Every call adds bars next() fires on, the conditions of one call must all hold.
+		self.__schedules.append({
+			"timeframe": timeframe,
+			"hours": hours,
+			"minutes": minutes,
+			"weekdays": weekdays,
+			"column": column
+		})
+
+	@final
+	def clear_schedule(self):
+		self.__schedules.clear()
+
+	@final
+	def __get_schedule_mask(self, datetimes: pd.DatetimeIndex) -> Union[np.ndarray, None]:
+		if len(self.__schedules) == 0:
+			return None
+
+		scheduled = np.zeros(self.__data.length, dtype=bool)
+
+		for schedule in self.__schedules:
+			mask = np.ones(self.__data.length, dtype=bool)
+
+			if schedule["timeframe"] is not None:
+				mask &= self.__data.get_first_min_of_timeframe_mask(schedule["timeframe"])
+
+			if schedule["hours"] is not None:
+				mask &= np.isin(datetimes.hour, schedule["hours"])
+
+			if schedule["minutes"] is not None:
+				mask &= np.isin(datetimes.minute, schedule["minutes"])
+
+			if schedule["weekdays"] is not None:
+				mask &= np.isin(datetimes.weekday, schedule["weekdays"])
+
+			if schedule["column"] is not None:
+				mask &= self.__data.column(schedule["column"]).astype(bool)
+
+			scheduled |= mask
+
+		return scheduled
+
+	@final
+	def add_indicator(self, indicator: Indicator, streaming: bool = False):
+		for output in indicator.outputs:
+			if any(output in x.outputs for x, _ in self.__indicators):
+				raise Exception(f"Indicator output '{output}' is already registered")
+
+		self.__indicators.append((indicator, streaming))
+
+	@property
+	def indicators(self) -> list[Indicator]:
+		return [x for x, _ in self.__indicators]
+
+	@final
+	def __add_indicator_columns(self, stream: bool = False):
+		self.__indicator_index = 0
+		self.__streams = []
+
+		cache = DiskCache(self.cfg.feature_cache_path, self.cfg.feature_cache_max_bytes) if self.cfg.feature_cache_path is not None else None
+		hashes = {}
+
+		# Chunks are only seen one at a time, so their indicators always run in streaming mode.
+		for indicator, streaming in self.__indicators:
+			if streaming or stream or self._has_chunks():
+				for output in indicator.outputs:
+					self.__data._add_column(output, np.full(self.__data.length, np.nan))
+
+				inputs = [self.__data.column(x) for x in indicator.inputs]
+				outputs = [self.__data.column(x) for x in indicator.outputs]
+				self.__streams.append((indicator, inputs, outputs))
+			else:
+				values = None
+
+				# Cached features are keyed by the input columns' content and the indicator's parameters.
+				if cache is not None:
+					for x in indicator.inputs:
+						if x not in hashes:
+							hashes[x] = fingerprint(self.__data.column(x))
+
+					key = fingerprint(indicator.__class__.__name__, indicator.params, [hashes[x] for x in indicator.inputs])
+					arrays = cache.get(key)
+					values = [arrays[str(i)] for i in range(len(indicator.outputs))] if arrays is not None else None
+
+				if values is None:
+					values = indicator.compute(*[self.__data.column(x) for x in indicator.inputs])
+
+					if cache is not None:
+						cache.set(key, {str(i): x for i, x in enumerate(values)})
+
+				for output, column in zip(indicator.outputs, values):
+					self.__data._add_column(output, column)
+
+	@final
+	def __update_indicators(self, stop: int):
+		# Streaming indicators catch up lazily, bars skipped by a schedule are folded in before next() reads them.
+		for i in range(self.__indicator_index, stop + 1):
+			for indicator, inputs, outputs in self.__streams:
+				for column, value in zip(outputs, indicator.update(*[x[i] for x in inputs])):
+					column[i] = value
+
+		self.__indicator_index = max(self.__indicator_index, stop + 1)
+
+	@final
+	def __get_triggers(self) -> list[tuple]:
+		# (order, side, price, below, column): below triggers on the column falling to the price, otherwise on it rising to it.
+		triggers = []
+		long = self.__positions[POSITION_SIDE_LONG]
+		short = self.__positions[POSITION_SIDE_SHORT]
+
+		if long is not None and long.stop_loss is not None:
+			triggers.append((ORDER_TYPE_STOP_LOSS, POSITION_SIDE_LONG, long.stop_loss, True, "low"))
+
+		if short is not None and short.stop_loss is not None:
+			triggers.append((ORDER_TYPE_STOP_LOSS, POSITION_SIDE_SHORT, short.stop_loss, False, "high"))
+
+		# Unleveraged positions can't be liquidated and add nothing to the search.
+		if self.cfg.liquidation:
+			extremes = "low" in self.__data and "high" in self.__data
+
+			if long is not None and long.leverage > 1:
+				column = "low" if extremes else long.close_price_column
+				triggers.append((ORDER_TYPE_LIQUIDATION, POSITION_SIDE_LONG, long.liquidation_price, True, column))
+
+			if short is not None and short.leverage > 1:
+				column = "high" if extremes else short.close_price_column
+				triggers.append((ORDER_TYPE_LIQUIDATION, POSITION_SIDE_SHORT, short.liquidation_price, False, column))
+
+		if long is not None and long.take_profit is not None:
+			triggers.append((ORDER_TYPE_TAKE_PROFIT, POSITION_SIDE_LONG, long.take_profit, False, "high"))
+
+		if short is not None and short.take_profit is not None:
+			triggers.append((ORDER_TYPE_TAKE_PROFIT, POSITION_SIDE_SHORT, short.take_profit, True, "low"))
+
+		for order in self.__orders:
+			below = order.side == POSITION_SIDE_LONG
+			triggers.append((order, order.side, order.price, below, "low" if below else "high"))
+
+		return triggers
+
+	@final
+	def __find_trigger(self, start: int) -> int:
+		triggers = self.__get_triggers()
+		trigger = self.__data.length if len(triggers) == 0 else min(start + _TRIGGER_HORIZON, self.__data.length)
+
+		for _, _, price, below, column in triggers:
+			values = self.__data.column(column)
+			trigger = utils.get_first_cross_index(values, price, below, start, trigger)
+
+		return trigger
+
+	@final
+	def __fill_orders(self):
+		filled = False
+
+		for order, side, price, below, column in self.__get_triggers():
+			if (self.__data[column] > price) if below else (self.__data[column] < price):
+				continue
+
+			# A bar that gaps through the price fills at its open.
+			fill_price = price
+
+			if "open" in self.__data:
+				fill_price = min(price, self.__data["open"]) if below else max(price, self.__data["open"])
+
+			position = self.__positions[side]
+
+			# A stop that would fill past the liquidation price is left to the liquidation.
+			if order == ORDER_TYPE_STOP_LOSS and position is not None and position.leverage > 1 and self.cfg.liquidation:
+				if (fill_price <= position.liquidation_price) if below else (fill_price >= position.liquidation_price):
+					continue
+
+			if isinstance(order, Order):
+				self.__orders.remove(order)
+
+				if side == POSITION_SIDE_LONG:
+					self.open_long(order.quantity, price=fill_price, close_price_column=order.close_price_column)
+				else:
+					self.open_short(order.quantity, price=fill_price, close_price_column=order.close_price_column)
+			elif order == ORDER_TYPE_LIQUIDATION and position is not None:
+				self.__liquidate(side, fill_price)
+			elif position is not None:
+				if side == POSITION_SIDE_LONG:
+					self.close_long(price=fill_price)
+				else:
+					self.close_short(price=fill_price)
+			else:
+				continue
+
+			filled = True
+
+		if filled:
+			self.__waiting = False
+
+		self.__trigger = None
+
+	@final
+	def __liquidate(self, side: str, price: float):
+		position = self.__positions[side]
+		qty = position.size
+		notional = price * qty
+
+		# An isolated position never loses more than its margin, even when the fill gaps past the liquidation price.
+		pnl = max(position.get_unrealized_pnl(price), -position.margin)
+		fee = min(notional * self.cfg.liquidation_fee_rate, position.margin + pnl)
+		order_side = ORDER_SIDE_SELL if side == POSITION_SIDE_LONG else ORDER_SIDE_BUY
+		self.broker._add_cash(position.margin + pnl - fee)
+		self.store._add_trade([self.__data["datetime"], order_side, qty, price, notional, fee, pnl])
+		self.store._add_transaction([self.__data["datetime"], TRANSACTION_TYPE_REALIZED_PNL, pnl])
+		self.store._add_transaction([self.__data["datetime"], TRANSACTION_TYPE_LIQUIDATION_FEE, fee * -1])
+		self.__positions[side] = None
+		self.__trigger = None
+
+	@final
+	def __get_equity_range(self, start: int, stop: int) -> np.ndarray:
+		amount = np.full(stop - start, self.broker.cash)
+
+		for side in [POSITION_SIDE_LONG, POSITION_SIDE_SHORT]:
+			position = self.__positions[side]
+
+			if position is not None:
+				price = self.__data.column(position.close_price_column)[start:stop]
+				pnl = (price - position.price) * position.size if side == POSITION_SIDE_LONG else (position.price - price) * position.size
+				amount += position.margin + pnl
+
+		return amount
+
+	@final
+	def __skip(self, start: int, stop: int, events: np.ndarray, funding: list, snapshots: list, equity: Union[np.ndarray, None]):
+		# Positions don't change on skipped bars, only funding and snapshot bars are visited.
+		i = start
+
+		for k in events[np.searchsorted(events, start):np.searchsorted(events, stop)].tolist():
+			if equity is not None:
+				equity[i:k] = self.__get_equity_range(i, k)
+
+			self.__data._seek(k)
+
+			if funding[k]:
+				self.__before_next()
+
+			if snapshots[k]:
+				self.__after_next()
+
+			if equity is not None:
+				equity[k] = self.__get_equity()
+
+			i = k + 1
+
+		if equity is not None:
+			equity[i:stop] = self.__get_equity_range(i, stop)
+
+	@final
+	def __save_checkpoint(self, chunk: int, index: int, bars: int, held: Union[tuple, None], equity: Union[np.ndarray, None]):
+		self._save_checkpoint({
+			"chunk": chunk,
+			"index": index,
+			"datetime": self.__data.datetimes()[index],
+			"bars": bars,
+			"held": held,
+			"equity": equity[:index].copy() if equity is not None else None,
+			"streams": [[x[:self.__indicator_index].copy() for x in outputs] for _, _, outputs in self.__streams]
+		}, ["_Strategy__data", "_Strategy__streams", "_Strategy__resumed"])
+
+	@final
+	def __restore_checkpoint(self, cursor: dict, equity: Union[np.ndarray, None]):
+		if cursor["index"] >= self.__data.length or self.__data.datetimes()[cursor["index"]] != cursor["datetime"]:
+			raise Exception("Checkpoint doesn't match the data feed")
+
+		if equity is not None:
+			equity[:cursor["index"]] = cursor["equity"]
+
+		# Streaming indicators resume from their pickled state, only the values already produced are copied back.
+		for (_, _, outputs), values in zip(self.__streams, cursor["streams"]):
+			for column, x in zip(outputs, values):
+				column[:len(x)] = x
+
+		self.__indicator_index = len(cursor["streams"][0][0]) if len(cursor["streams"]) > 0 else 0
+
+	@final
+	def resume(self) -> Union[Report, MetricsReport]:
+		# Without a checkpoint on disk the run simply starts from the first bar.
+		self.__resumed = self._load_checkpoint()
+		return self.run()
+
 	def next(self):
 		pass
 
 	@final
-	def run(self) -> Report:
-		if self.store.data is None or len(self.store.data) == 0:
-			raise Exception("Data feed is empty")
+	def run(self) -> Union[Report, MetricsReport]:
+		resumed, self.__resumed = self.__resumed, None
+
+		if resumed is None:
+			self.__seeded = False
+
+			for indicator, _ in self.__indicators:
+				indicator.reset()
+
+		return self.__run(self._get_chunks(), resumed=resumed)
+
+	@final
+	def append(self, data: pd.DataFrame) -> Union[Report, MetricsReport]:
+		if not self.__completed:
+			raise Exception("Bars can only be appended after run()")
+
+		data = self._append_data(data)
+
+		if len(data.index) == 0:
+			return self._get_report()
+
+		# Batch indicators are brought once to the streaming state at the last bar, appended bars then only stream.
+		if not self.__seeded:
+			for indicator, streaming in self.__indicators:
+				if not streaming and not self._has_chunks():
+					indicator.seed(*[self.__data.column(x) for x in indicator.inputs])
+
+			self.__seeded = True
 
-		if self.broker.cash == 0:
-			raise Exception("Insufficient funds")
+		# The last equity candle may go on in the new bars, so it is taken back out of the journal and merged again.
+		held, mark = self.__tail if self.__tail is not None else (None, None)
 
-		if not "datetime" in self.store.data.columns or not is_datetime64_ns_dtype(self.store.data["datetime"]):
-			raise Exception("Data feed must have column 'datetime' as Pandas Timestamp")
+		if held is not None:
+			self.store._rewind_equity_curve(mark)
 
-		for row in self.store.data.values:
-			self.__data = dict(zip(self.store.data.columns, row))
+		return self.__run([data], held=held, appended=True)
 
-			if self.__skip_next():
+	@final
+	def __run(self, chunks: Iterable[pd.DataFrame], resumed: Union[dict, None] = None, held: Union[tuple, None] = None, appended: bool = False) -> Union[Report, MetricsReport]:
+		started = False
+		bars = 0
+		every = self.cfg.checkpoint_bars if self.cfg.checkpoint_path is not None and not appended else None
+
+		if resumed is not None:
+			held, bars = resumed["held"], resumed["bars"]
+
+		# A chunked feed is processed frame by frame, positions, cash and journals carry over between frames.
+		for n, chunk in enumerate(chunks):
+			# Chunks before a checkpoint's cursor are only read, their bars are already in the restored state.
+			if resumed is not None and n < resumed["chunk"]:
 				continue
 
-			self.__before_next()
-			self.next()
-			self.__after_next()
+			self._check_data()
+
+			if not started:
+				if resumed is None and not appended:
+					self._start_metrics()
+
+				self._start_profile(_PROFILE_SECTIONS)
+				started = True
+
+			self.__data = Bar(chunk)
+			self.__add_indicator_columns(appended)
+			streams = len(self.__streams) > 0
+
+			# Funding and snapshot bars are known up front, so the timestamps aren't inspected on every bar.
+			datetimes = self.__data.datetimes()
+			funding_mask = self._get_funding_mask(datetimes)
+			snapshot_mask = self._get_snapshot_mask(datetimes)
+			funding = funding_mask.tolist()
+			snapshots = snapshot_mask.tolist()
+			events = np.flatnonzero(funding_mask | snapshot_mask)
+
+			# With a schedule next() only fires on scheduled bars and the stretches in between are skipped.
+			schedule_mask = self.__get_schedule_mask(datetimes)
+			scheduled = schedule_mask.tolist() if schedule_mask is not None else None
+			calls = np.flatnonzero(schedule_mask) if schedule_mask is not None else None
+
+			# Mark-to-market equity goes straight into one preallocated array instead of a journal row per bar.
+			equity = np.full(self.__data.length, np.nan) if self.cfg.equity_curve else None
+			length = self.__data.length
+			offset = bars
+			bars += length
+			self.__trigger = None
+			i = 0
+
+			if resumed is not None:
+				self.__restore_checkpoint(resumed, equity)
+				i = resumed["index"]
+				resumed = None
+
+			# Checkpoints fall on every `every`-th bar of the whole feed, taken before that bar is processed.
+			checkpoint_at = ((offset + i) // every + 1) * every - offset if every is not None else length
+
+			while i < length:
+				if i >= checkpoint_at:
+					self.__save_checkpoint(n, i, offset, held, equity)
+					checkpoint_at = ((offset + i) // every + 1) * every - offset
+
+				self.__data._seek(i)
+
+				if self.__skip_next():
+					i += 1
+					continue
+
+				if funding[i]:
+					self.__before_next()
+
+				# The next bar a resting order can fill on is searched ahead, other bars only compare an index.
+				if self.__trigger is None:
+					self.__trigger = self.__find_trigger(i)
+
+				if i >= self.__trigger:
+					self.__fill_orders()
+
+				if not self.__waiting and (scheduled is None or scheduled[i]):
+					if streams:
+						self.__update_indicators(i)
+
+					self.next()
+
+				if snapshots[i]:
+					self.__after_next()
+
+				if equity is not None:
+					equity[i] = self.__get_equity()
+
+				i += 1
+
+				if i < length and (self.__waiting or calls is not None):
+					if self.__trigger is None:
+						self.__trigger = self.__find_trigger(i)
+
+					stop = self.__trigger
+
+					if not self.__waiting:
+						k = np.searchsorted(calls, i)
+						stop = min(stop, int(calls[k]) if k < len(calls) else length)
+
+					if stop > i:
+						self.__skip(i, stop, events, funding, snapshots, equity)
+						i = stop
+
+			if streams:
+				self.__update_indicators(length - 1)
+
+			if equity is not None:
+				if held is not None:
+					datetimes, equity = held[0].append(datetimes), np.r_[held[1], equity]
+
+				held = self._extend_equity_curve(datetimes, equity, final=False)
+
+		if resumed is not None:
+			raise Exception("Checkpoint doesn't match the data feed")
+
+		self.__tail = None
+
+		if held is not None:
+			self.__tail = (held, self.store._get_equity_curve_mark())
+			self._extend_equity_curve(*held)
 
-		return Report(
-			strategy=self.__class__.__name__,
-			broker=self.broker,
-			cfg=self.cfg,
-			store=self.store,
-		)
+		self.__completed = True
+		return self._get_report(bars)
@@ -0,0 +1,118 @@
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Union
+import itertools
+import os
+import pandas as pd
+from .backtester import *
+from .shared import *
+from .reference import *
+from .report import *
+
+_worker = {}
+
+def get_parameter_grid(grid: dict) -> list[dict]:
+	keys = list(grid.keys())
+	return [dict(zip(keys, values)) for values in itertools.product(*[grid[k] for k in keys])]
+
+def summarize(report: Union[Report, MetricsReport]) -> dict:
+	return {
+		"trades": int(report.trades_qty * 2),
+		"realized_pnl": report.realized_pnl,
+		"fees": report.total_fees,
+		"end_cash": report.end_cash,
+		"return_pct": report.cumulative_return_pct,
+		"sharpe_ratio": report.sharpe_ratio,
+		"max_drawdown_pct": report.max_drawdown_pct,
+		"win_ratio": report.win_ratio
+	}
+
+def _apply(strategy: Backtester, params: dict):
+	for key, value in params.items():
+		if hasattr(Backtester, f"set_{key}"):
+			getattr(strategy, f"set_{key}")(value)
+		else:
+			setattr(strategy, key, value)
+
+def _init_worker(strategy: type, data: Union[pd.DataFrame, SharedData], settings: dict):
+	_worker["strategy"] = strategy
+	_worker["data"] = data.data if isinstance(data, SharedData) else data.reset_index()
+	_worker["settings"] = settings
+
+def _run(params: dict, start: Union[int, None] = None, stop: Union[int, None] = None) -> Report:
+	strategy = _worker["strategy"]()
+	_apply(strategy, _worker["settings"])
+	_apply(strategy, params)
+	strategy.store.data = _worker["data"].iloc[start:stop]
+	return strategy.run()
+
+def _run_summary(params: dict, start: Union[int, None] = None, stop: Union[int, None] = None) -> dict:
+	return summarize(_run(params, start, stop))
+
+def _map(
+	func: Callable,
+	tasks: list[tuple],
+	strategy: type,
+	data: Union[pd.DataFrame, SharedData],
+	settings: dict,
+	processes: int,
+	progress: Union[Callable[[int, int], None], None]
+) -> list[tuple]:
+	results = [None] * len(tasks)
+	done = 0
+
+	def collect(i: int, result, error: Union[str, None]):
+		nonlocal done
+		results[i] = (result, error)
+		done += 1
+
+		if progress is not None:
+			progress(done, len(tasks))
+
+	if processes <= 1:
+		_init_worker(strategy, data, settings)
+
+		try:
+			for i, task in enumerate(tasks):
+				try:
+					collect(i, func(*task), None)
+				except Exception as e:
+					collect(i, None, repr(e))
+		finally:
+			_worker.clear()
+	else:
+		# Workers attach to the shared block instead of receiving a pickled copy of the frame.
+		shared = data if isinstance(data, SharedData) else SharedData(data)
+
+		try:
+			with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker, initargs=(strategy, shared, settings)) as pool:
+				futures = {pool.submit(func, *task): i for i, task in enumerate(tasks)}
+
+				for future in as_completed(futures):
+					try:
+						collect(futures[future], future.result(), None)
+					except BrokenProcessPool as e:
+						collect(futures[future], None, f"Worker process died: {e!r}")
+					except Exception as e:
+						collect(futures[future], None, repr(e))
+		finally:
+			if shared is not data:
+				shared.unlink()
+				shared.close()
+
+	return results
+
+def sweep(
+	strategy: type,
+	grid: dict,
+	data: Union[pd.DataFrame, SharedData],
+	settings: Union[dict, None] = None,
+	processes: Union[int, None] = None,
+	progress: Union[Callable[[int, int], None], None] = None
+) -> pd.DataFrame:
+	params = get_parameter_grid(grid)
+	settings = settings if settings is not None else {}
+	processes = processes if processes is not None else os.cpu_count()
+	results = _map(_run_summary, [(p,) for p in params], strategy, data, settings, processes, progress)
+	return pd.DataFrame([{**p, **(r if r is not None else {}), "error": e} for p, (r, e) in zip(params, results)])
@@ -1,7 +1,13 @@
 from __future__ import (absolute_import, division, print_function, unicode_literals)
+from typing import Union
+import numpy as np
 import pandas as pd
 from .reference import *
 
+# Monday 00:00, weekly candles open on Monday.
+TIMEFRAME_ORIGIN = pd.Timestamp("1970-01-05").value
+_MINUTE = pd.Timedelta(60, unit="sec").value
+
 def is_first_min_of_timeframe(ts: pd.Timestamp, timeframe: str) -> bool:
 	if timeframe == "1m":
 		return True
@@ -166,6 +172,58 @@ def get_timeframe_timedelta(timeframe: str) -> pd.Timedelta:
 	elif timeframe == "1W":
 		return pd.Timedelta(604800, unit="sec")
 
+def _get_wall_nanoseconds(values: Union[pd.DatetimeIndex, pd.Series, np.ndarray]) -> np.ndarray:
+	if isinstance(values, np.ndarray) and not np.issubdtype(values.dtype, np.datetime64):
+		return values.astype(np.int64, copy=False)
+
+	index = pd.DatetimeIndex(values)
+
+	if index.tz is not None:
+		index = index.tz_localize(None)
+
+	return index.as_unit("ns").asi8
+
+def _shift(values: Union[pd.DatetimeIndex, pd.Series, np.ndarray], nanoseconds: np.ndarray) -> Union[pd.DatetimeIndex, np.ndarray]:
+	if isinstance(values, np.ndarray) and not np.issubdtype(values.dtype, np.datetime64):
+		return values - nanoseconds
+
+	return pd.DatetimeIndex(values) - pd.to_timedelta(nanoseconds, unit="ns")
+
+def _get_minutes_into_candle(nanoseconds: np.ndarray, timeframe: str) -> np.ndarray:
+	delta = get_timeframe_timedelta(timeframe).value
+	return ((nanoseconds - TIMEFRAME_ORIGIN) % delta) // _MINUTE
+
+def get_first_min_of_timeframe_mask(values: Union[pd.DatetimeIndex, pd.Series, np.ndarray], timeframe: str) -> np.ndarray:
+	return _get_minutes_into_candle(_get_wall_nanoseconds(values), timeframe) == 0
+
+def get_last_min_of_timeframe_mask(values: Union[pd.DatetimeIndex, pd.Series, np.ndarray], timeframe: str) -> np.ndarray:
+	return _get_minutes_into_candle(_get_wall_nanoseconds(values), timeframe) == (get_timeframe_timedelta(timeframe).value // _MINUTE) - 1
+
+def get_candle_open_timestamps(values: Union[pd.DatetimeIndex, pd.Series, np.ndarray], timeframe: str) -> Union[pd.DatetimeIndex, np.ndarray]:
+	return _shift(values, _get_minutes_into_candle(_get_wall_nanoseconds(values), timeframe) * _MINUTE)
+
+def get_prev_candle_open_timestamps(values: Union[pd.DatetimeIndex, pd.Series, np.ndarray], timeframe: str) -> Union[pd.DatetimeIndex, np.ndarray]:
+	n = _get_minutes_into_candle(_get_wall_nanoseconds(values), timeframe) * _MINUTE
+	return _shift(values, n + get_timeframe_timedelta(timeframe).value)
+
+def get_first_cross_index(values: np.ndarray, price: float, below: bool, start: int = 0, stop: Union[int, None] = None) -> int:
+	n = len(values) if stop is None else min(stop, len(values))
+	size = 1024
+
+	# Windows double in size, so a cross k bars ahead costs O(k) to find whatever the length of the array.
+	while start < n:
+		window = values[start:min(start + size, n)]
+		hits = window <= price if below else window >= price
+		k = int(hits.argmax())
+
+		if hits[k]:
+			return start + k
+
+		start += size
+		size *= 2
+
+	return n
+
 def get_liquidation_price(side: str, open_price: float, leverage: int) -> float:
 	if side == POSITION_SIDE_LONG:
 		return (open_price * leverage) / (leverage + 1 - (0.01 * leverage))
@@ -0,0 +1,300 @@
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+from typing import final
+from typing import Union
+import numpy as np
+import pandas as pd
+from .backtester import *
+from .reference import *
+from .report import *
+from . import utils
+
+_EVENT_FUNDING_LONG = 0
+_EVENT_FUNDING_SHORT = 1
+_EVENT_LIQUIDATE_LONG = 2
+_EVENT_LIQUIDATE_SHORT = 3
+_EVENT_CLOSE_LONG = 4
+_EVENT_CLOSE_SHORT = 5
+_EVENT_OPEN_LONG = 6
+_EVENT_OPEN_SHORT = 7
+
+def _to_mask(values, length: int) -> np.ndarray:
+	if values is None:
+		return np.zeros(length, dtype=bool)
+
+	mask = np.asarray(values, dtype=bool)
+
+	if mask.shape != (length,):
+		raise Exception("Signals must be aligned with the data feed")
+
+	return mask
+
+def _to_size(values, length: int) -> np.ndarray:
+	if values is None:
+		return np.full(length, np.nan)
+
+	size = np.asarray(values, dtype=np.float64)
+
+	if size.ndim == 0:
+		return np.full(length, float(size))
+
+	if size.shape != (length,):
+		raise Exception("Size must be aligned with the data feed")
+
+	return size
+
+def _journal(datetimes: pd.arrays.DatetimeArray, names: list[str], events: list) -> dict:
+	idx = np.concatenate([e[0] for e in events])
+	keys = np.concatenate([np.full(len(e[0]), e[1]) for e in events])
+	order = np.lexsort((keys, idx))
+	columns = {"datetime": datetimes[idx[order]]}
+
+	for c, name in enumerate(names, start=2):
+		values = [np.full(len(e[0]), e[c], dtype=object) if isinstance(e[c], str) else e[c] for e in events]
+		columns[name] = np.concatenate(values)[order]
+
+	return columns
+
+def _get_liquidations(side: str, entry_idx: np.ndarray, entry_qty: np.ndarray, entry_price: np.ndarray, exit_idx: np.ndarray, values: np.ndarray, leverage: int) -> np.ndarray:
+	below = side == POSITION_SIDE_LONG
+	length = len(values)
+	liquidations = []
+	size, cost, opened = 0.0, 0.0, -1
+
+	# Between two changes a position is held as is, so each stretch is searched ahead for its liquidation price.
+	for j in range(len(entry_idx) + 1):
+		stop = int(entry_idx[j]) if j < len(entry_idx) else length - 1
+
+		if size > 0:
+			k = np.searchsorted(exit_idx, opened, side="right")
+			exit_at = int(exit_idx[k]) if k < len(exit_idx) else length
+			end = min(exit_at, stop)
+			price = utils.get_liquidation_price(side, cost / size, leverage)
+			i = utils.get_first_cross_index(values, price, below, opened + 1, end + 1)
+
+			# Liquidations are checked before the signals of a bar, so they win over an exit on the same bar.
+			if i <= end:
+				liquidations.append(i)
+				size, cost = 0.0, 0.0
+			elif exit_at <= stop:
+				size, cost = 0.0, 0.0
+
+		if j < len(entry_idx):
+			size += entry_qty[j]
+			cost += entry_qty[j] * entry_price[j]
+			opened = stop
+
+	return np.array(liquidations, dtype=np.int64)
+
+class _Side:
+	def __init__(self, entries: np.ndarray, exits: np.ndarray, size: np.ndarray, price: np.ndarray, side: str, liquidation: Union[tuple, None] = None):
+		self.entry_idx = np.flatnonzero(entries)
+		self.entry_qty = size[self.entry_idx]
+		self.entry_price = price[self.entry_idx]
+		self.entry_notional = self.entry_price * self.entry_qty
+		self.signal_exit_idx = np.flatnonzero(exits)
+
+		if np.any(np.isnan(self.entry_qty) | (self.entry_qty <= 0)):
+			raise Exception("Quantity must be greater zero")
+
+		liquidation_idx = np.array([], dtype=np.int64)
+
+		if liquidation is not None:
+			liquidation_idx = _get_liquidations(side, self.entry_idx, self.entry_qty, self.entry_price, self.signal_exit_idx, *liquidation)
+
+		# Every exit signal or liquidation closes the current segment, entries on that bar open the next one.
+		bounds = np.r_[liquidation_idx, self.signal_exit_idx]
+		liquidated = np.r_[np.ones(len(liquidation_idx), dtype=bool), np.zeros(len(self.signal_exit_idx), dtype=bool)]
+		order = np.lexsort((~liquidated, bounds))
+		self.bound_idx, liquidated = bounds[order], liquidated[order]
+		self.entry_segment = np.searchsorted(self.bound_idx, self.entry_idx, side="right")
+		self.size = pd.Series(self.entry_qty).groupby(self.entry_segment).cumsum().to_numpy()
+		self.cost = pd.Series(self.entry_notional).groupby(self.entry_segment).cumsum().to_numpy()
+
+		# Exit signals without an opened position are ignored.
+		segments = np.arange(len(self.bound_idx))
+		last = np.searchsorted(self.entry_segment, segments, side="right") - 1
+		valid = last >= 0
+		valid[valid] = self.entry_segment[last[valid]] == segments[valid]
+		exits = valid & ~liquidated
+		self.exit_idx = self.bound_idx[exits]
+		self.exit_qty = self.size[last[exits]]
+		self.exit_avg_price = self.cost[last[exits]] / self.exit_qty
+		self.liquidation_idx = self.bound_idx[liquidated]
+		self.liquidation_qty = self.size[last[liquidated]]
+		self.liquidation_avg_price = self.cost[last[liquidated]] / self.liquidation_qty
+
+	def state(self, idx: np.ndarray, inclusive: bool) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+		side = "right" if inclusive else "left"
+		last = np.searchsorted(self.entry_idx, idx, side=side) - 1
+		segment = np.searchsorted(self.bound_idx, idx, side=side)
+		is_open = last >= 0
+		is_open[is_open] = self.entry_segment[last[is_open]] == segment[is_open]
+
+		# A side without entries is never open, its cumulative arrays are empty.
+		if len(self.entry_idx) == 0:
+			return is_open, np.zeros(len(idx)), np.zeros(len(idx))
+
+		size = np.where(is_open, self.size[last], 0.0)
+		price = np.where(is_open, self.cost[last] / np.where(is_open, self.size[last], 1.0), 0.0)
+		return is_open, price, size
+
+def _get_equity(idx: np.ndarray, bars: np.ndarray, cash: np.ndarray, sides: dict, price: np.ndarray, leverage: int) -> np.ndarray:
+	amount = cash[np.searchsorted(bars, idx, side="right")]
+
+	for side in [POSITION_SIDE_LONG, POSITION_SIDE_SHORT]:
+		is_open, avg_price, pos_size = sides[side].state(idx, inclusive=True)
+		margin = (avg_price * pos_size) * (1 / leverage)
+		pnl = (price[idx] - avg_price) * pos_size if side == POSITION_SIDE_LONG else (avg_price - price[idx]) * pos_size
+		amount = np.where(is_open, amount + (margin + pnl), amount)
+
+	return amount
+
+class SignalStrategy(Backtester):
+	def signals(self) -> dict:
+		return {}
+
+	@final
+	def run(
+		self,
+		long_entries: Union[np.ndarray, pd.Series, None] = None,
+		long_exits: Union[np.ndarray, pd.Series, None] = None,
+		short_entries: Union[np.ndarray, pd.Series, None] = None,
+		short_exits: Union[np.ndarray, pd.Series, None] = None,
+		size: Union[np.ndarray, pd.Series, float, None] = None,
+		price_column: str = "close"
+	) -> Union[Report, MetricsReport]:
+		if all(x is None for x in [long_entries, long_exits, short_entries, short_exits]):
+			signals = self.signals()
+
+			if len(signals) > 0:
+				if all(signals.get(x) is None for x in ["long_entries", "long_exits", "short_entries", "short_exits"]):
+					raise Exception("signals() must return at least one of 'long_entries', 'long_exits', 'short_entries' or 'short_exits'")
+
+				return self.run(**signals)
+
+		if self._has_chunks():
+			raise Exception("SignalStrategy needs the whole data feed, chunked feeds aren't supported")
+
+		self._check_data()
+		self._start_metrics()
+		self._start_profile({})
+
+		data = self.store.data
+		length = len(data.index)
+		datetimes = data["datetime"].array
+		price = data[price_column].to_numpy(dtype=np.float64)
+		size = _to_size(size, length)
+		leverage = self.cfg.leverage
+		fee_rate = self.cfg.fee_rate
+
+		extremes = "low" in data.columns and "high" in data.columns
+		liquidation = {POSITION_SIDE_LONG: None, POSITION_SIDE_SHORT: None}
+
+		if self.cfg.liquidation and leverage > 1:
+			for side, column in [(POSITION_SIDE_LONG, "low"), (POSITION_SIDE_SHORT, "high")]:
+				liquidation[side] = (data[column if extremes else price_column].to_numpy(dtype=np.float64), leverage)
+
+		sides = {
+			POSITION_SIDE_LONG: _Side(_to_mask(long_entries, length), _to_mask(long_exits, length), size, price, POSITION_SIDE_LONG, liquidation[POSITION_SIDE_LONG]),
+			POSITION_SIDE_SHORT: _Side(_to_mask(short_entries, length), _to_mask(short_exits, length), size, price, POSITION_SIDE_SHORT, liquidation[POSITION_SIDE_SHORT])
+		}
+
+		bars, kinds, deltas = [], [], []
+		trades, transactions = [], []
+
+		# Funding is charged before any signal of the bar is executed.
+		funding_idx = np.flatnonzero(self._get_funding_mask(pd.DatetimeIndex(datetimes)))
+
+		for kind, side in [(_EVENT_FUNDING_LONG, POSITION_SIDE_LONG), (_EVENT_FUNDING_SHORT, POSITION_SIDE_SHORT)]:
+			if side == POSITION_SIDE_LONG and leverage <= 1:
+				continue
+
+			is_open, avg_price, pos_size = sides[side].state(funding_idx, inclusive=False)
+			idx = funding_idx[is_open]
+			fee = (avg_price[is_open] * pos_size[is_open]) * self.cfg.funding_rate
+			bars.append(idx)
+			kinds.append(np.full(len(idx), kind))
+			deltas.append(fee * -1)
+			transactions.append((idx, kind * 2, TRANSACTION_TYPE_FUNDING_FEE, fee * -1))
+
+		# A bar that gaps through the liquidation price fills at its open, the loss stops at the position's margin.
+		for kind, side, order_side in [(_EVENT_LIQUIDATE_LONG, POSITION_SIDE_LONG, ORDER_SIDE_SELL), (_EVENT_LIQUIDATE_SHORT, POSITION_SIDE_SHORT, ORDER_SIDE_BUY)]:
+			s = sides[side]
+			idx = s.liquidation_idx
+			qty = s.liquidation_qty
+			fill_price = utils.get_liquidation_price(side, s.liquidation_avg_price, leverage)
+
+			if "open" in data.columns:
+				open_price = data["open"].to_numpy(dtype=np.float64)[idx]
+				fill_price = np.fmin(fill_price, open_price) if side == POSITION_SIDE_LONG else np.fmax(fill_price, open_price)
+
+			margin = (s.liquidation_avg_price * qty) * (1 / leverage)
+			pnl = (fill_price - s.liquidation_avg_price) * qty if side == POSITION_SIDE_LONG else (s.liquidation_avg_price - fill_price) * qty
+			pnl = np.maximum(pnl, margin * -1)
+			notional = fill_price * qty
+			fee = np.minimum(notional * self.cfg.liquidation_fee_rate, margin + pnl)
+			bars.append(idx)
+			kinds.append(np.full(len(idx), kind))
+			deltas.append(margin + pnl - fee)
+			trades.append((idx, kind, order_side, qty, fill_price, notional, fee, pnl))
+			transactions.append((idx, kind * 2, TRANSACTION_TYPE_REALIZED_PNL, pnl))
+			transactions.append((idx, kind * 2 + 1, TRANSACTION_TYPE_LIQUIDATION_FEE, fee * -1))
+
+		for kind, side, order_side in [(_EVENT_CLOSE_LONG, POSITION_SIDE_LONG, ORDER_SIDE_SELL), (_EVENT_CLOSE_SHORT, POSITION_SIDE_SHORT, ORDER_SIDE_BUY)]:
+			s = sides[side]
+			idx = s.exit_idx
+			exit_price = price[idx]
+			qty = s.exit_qty
+			pnl = (exit_price - s.exit_avg_price) * qty if side == POSITION_SIDE_LONG else (s.exit_avg_price - exit_price) * qty
+			notional = exit_price * qty
+			fee = notional * fee_rate
+			margin = (s.exit_avg_price * qty) * (1 / leverage)
+			bars.append(idx)
+			kinds.append(np.full(len(idx), kind))
+			deltas.append(margin + pnl - fee)
+			trades.append((idx, kind, order_side, qty, exit_price, notional, fee, pnl))
+			transactions.append((idx, kind * 2, TRANSACTION_TYPE_REALIZED_PNL, pnl))
+			transactions.append((idx, kind * 2 + 1, TRANSACTION_TYPE_COMMISSION, fee * -1))
+
+		entry_checks = []
+
+		for kind, side, order_side in [(_EVENT_OPEN_LONG, POSITION_SIDE_LONG, ORDER_SIDE_BUY), (_EVENT_OPEN_SHORT, POSITION_SIDE_SHORT, ORDER_SIDE_SELL)]:
+			s = sides[side]
+			idx = s.entry_idx
+			fee = s.entry_notional * fee_rate
+			margin = s.entry_notional * (1 / leverage)
+			bars.append(idx)
+			kinds.append(np.full(len(idx), kind))
+			deltas.append((margin + fee) * -1)
+			entry_checks.append((kind, margin + fee))
+			trades.append((idx, kind, order_side, s.entry_qty, s.entry_price, s.entry_notional, fee, np.full(len(idx), np.nan)))
+			transactions.append((idx, kind * 2, TRANSACTION_TYPE_COMMISSION, fee * -1))
+
+		bars = np.concatenate(bars)
+		kinds = np.concatenate(kinds)
+		deltas = np.concatenate(deltas)
+		order = np.lexsort((kinds, bars))
+		bars, kinds, deltas = bars[order], kinds[order], deltas[order]
+		cash = np.cumsum(np.concatenate(([self.broker.cash], deltas)))
+
+		for kind, required in entry_checks:
+			before = cash[:-1][kinds == kind]
+
+			if np.any(before < required):
+				raise Exception("Insufficient funds")
+
+		self.broker._set_cash(float(cash[-1]))
+		self.store._extend_trades(_journal(datetimes, ["side", "quantity", "price", "notional", "fee", "realized_pnl"], trades))
+		self.store._extend_transactions(_journal(datetimes, ["type", "amount"], transactions))
+
+		# Portfolio snapshots are taken after all signals of the 00:00 bar are executed.
+		snapshot_idx = np.flatnonzero(self._get_snapshot_mask(pd.DatetimeIndex(datetimes)))
+		amount = _get_equity(snapshot_idx, bars, cash, sides, price, leverage)
+		self.store._extend_portfolio_history({"datetime": datetimes[snapshot_idx], "amount": amount})
+
+		if self.cfg.equity_curve:
+			equity = _get_equity(np.arange(length), bars, cash, sides, price, leverage)
+			self._extend_equity_curve(pd.DatetimeIndex(datetimes), equity)
+
+		return self._get_report(length)
+
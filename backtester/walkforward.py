@@ -0,0 +1,162 @@
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+from typing import Callable, Union
+import os
+import numpy as np
+import pandas as pd
+from .report import *
+from .shared import *
+from .sweep import *
+from .sweep import _map, _run, _run_summary
+
+def _get_progress(progress: Union[Callable[[int, int], None], None], offset: int, total: int) -> Union[Callable[[int, int], None], None]:
+	if progress is None:
+		return None
+
+	# Both phases count towards one total, so callers see a single rising value.
+	return lambda done, _: progress(offset + done, total)
+
+class WalkForwardReport(object):
+	def __init__(self, windows: pd.DataFrame, reports: list[Union[Report, None]]):
+		self.__windows = windows
+		self.__reports = reports
+		self.__returns = None
+
+	@property
+	def windows(self) -> pd.DataFrame:
+		return self.__windows
+
+	@property
+	def reports(self) -> list[Union[Report, None]]:
+		return self.__reports
+
+	@property
+	def returns(self) -> pd.DataFrame:
+		if self.__returns is None:
+			frames = []
+			start_cash = np.nan
+
+			for window, report in enumerate(self.__reports):
+				if report is None:
+					continue
+
+				if np.isnan(start_cash):
+					start_cash = report.start_cash
+
+				returns = report.returns[["datetime", "percent"]].copy()
+				returns.insert(0, "window", window)
+				frames.append(returns)
+
+			if len(frames) == 0:
+				self.__returns = pd.DataFrame(columns=["window", "datetime", "percent", "amount"])
+			else:
+				returns = pd.concat(frames, ignore_index=True)
+				returns["amount"] = start_cash * (1 + returns["percent"].fillna(0)).cumprod()
+				self.__returns = returns
+
+		return self.__returns
+
+def get_walk_forward_windows(datetimes: pd.DatetimeIndex, train: pd.Timedelta, test: pd.Timedelta, step: Union[pd.Timedelta, None] = None) -> pd.DataFrame:
+	step = step if step is not None else test
+	rows = []
+	train_start = datetimes[0]
+
+	while True:
+		test_start = train_start + train
+		test_end = test_start + test
+
+		if test_start > datetimes[-1]:
+			break
+
+		rows.append([
+			train_start,
+			test_start,
+			test_end,
+			datetimes.searchsorted(train_start, side="left"),
+			datetimes.searchsorted(test_start, side="left"),
+			datetimes.searchsorted(test_end, side="left")
+		])
+
+		train_start += step
+
+	return pd.DataFrame(rows, columns=["train_start", "test_start", "test_end", "train_idx", "test_idx", "end_idx"])
+
+def walk_forward(
+	strategy: type,
+	grid: dict,
+	data: Union[pd.DataFrame, SharedData],
+	train: Union[pd.Timedelta, str],
+	test: Union[pd.Timedelta, str],
+	step: Union[pd.Timedelta, str, None] = None,
+	metric: str = "sharpe_ratio",
+	maximize: bool = True,
+	settings: Union[dict, None] = None,
+	processes: Union[int, None] = None,
+	progress: Union[Callable[[int, int], None], None] = None
+) -> WalkForwardReport:
+	settings = settings if settings is not None else {}
+	processes = processes if processes is not None else os.cpu_count()
+	shared = data if isinstance(data, SharedData) or processes <= 1 else SharedData(data)
+
+	if isinstance(shared, SharedData):
+		datetimes = pd.DatetimeIndex(shared.data["datetime"])
+	else:
+		datetimes = pd.DatetimeIndex(data["datetime"] if "datetime" in data.columns else data.index)
+
+	windows = get_walk_forward_windows(
+		datetimes,
+		pd.Timedelta(train),
+		pd.Timedelta(test),
+		pd.Timedelta(step) if step is not None else None
+	)
+
+	params = get_parameter_grid(grid)
+
+	try:
+		# Every in-sample run of every window is an independent task, windows only meet again when picking the winner.
+		tasks = [(p, w.train_idx, w.test_idx) for w in windows.itertuples() for p in params]
+		total = len(tasks) + len(windows.index)
+		summaries = _map(_run_summary, tasks, strategy, shared, settings, processes, _get_progress(progress, 0, total))
+
+		best = []
+
+		for i in range(len(windows.index)):
+			scores = [r[metric] if r is not None else np.nan for r, _ in summaries[i * len(params):(i + 1) * len(params)]]
+			scores = np.array(scores, dtype=np.float64)
+
+			if np.all(np.isnan(scores)):
+				best.append((None, np.nan))
+			else:
+				j = int(np.nanargmax(scores) if maximize else np.nanargmin(scores))
+				best.append((params[j], scores[j]))
+
+		tasks = [(p, w.test_idx, w.end_idx) for (p, _), w in zip(best, windows.itertuples()) if p is not None]
+
+		# Windows without a valid in-sample run have no out-of-sample run and are done already.
+		done = total - len(tasks)
+
+		if progress is not None and done > len(summaries):
+			progress(done, total)
+
+		results = iter(_map(_run, tasks, strategy, shared, settings, processes, _get_progress(progress, done, total)))
+	finally:
+		if shared is not data and isinstance(shared, SharedData):
+			shared.unlink()
+			shared.close()
+
+	reports = []
+	errors = []
+
+	for p, _ in best:
+		if p is None:
+			reports.append(None)
+			errors.append("No valid in-sample run")
+		else:
+			report, error = next(results)
+			reports.append(report)
+			errors.append(error)
+
+	windows = windows.drop(columns=["train_idx", "test_idx", "end_idx"])
+	windows["params"] = [p for p, _ in best]
+	windows[f"in_sample_{metric}"] = [score for _, score in best]
+	windows["error"] = errors
+	return WalkForwardReport(windows, reports)
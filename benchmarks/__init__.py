@@ -0,0 +1,4 @@
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+from .data import *
+from .strategies import *
+from .suite import *
@@ -0,0 +1,31 @@
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+import argparse
+import sys
+from .suite import *
+
+parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Times Strategy.run, Report and utils on synthetic 1m OHLCV data.")
+parser.add_argument("--size", default="1M", help=f"data size, one of {list(SIZES.keys())} or a number of days")
+parser.add_argument("--repeat", type=int, default=3)
+parser.add_argument("--seed", type=int, default=0)
+parser.add_argument("--strategy", action="append", dest="strategies", choices=list(STRATEGIES.keys()))
+parser.add_argument("--output", help="write results as JSON to this path")
+parser.add_argument("--baseline", help="compare against results saved by an earlier --output")
+parser.add_argument("--tolerance", type=float, default=0.2, help="slowdown ratio above 1 flagged as a regression")
+parser.add_argument("--min-delta", type=float, default=0.005, help="seconds a slowdown must add to be flagged")
+args = parser.parse_args()
+
+size = args.size if args.size in SIZES else int(args.size)
+results = run_suite(size, repeat=args.repeat, seed=args.seed, strategies=args.strategies)
+
+if args.output is not None:
+	save_results(results, args.output)
+
+if args.baseline is None:
+	for name, seconds in results["results"].items():
+		print(f"{name:<45} {seconds:>10.4f}s")
+
+	sys.exit(0)
+
+comparison = compare(results, load_results(args.baseline), args.tolerance, args.min_delta)
+print(comparison.to_string(index=False))
+sys.exit(1 if comparison["regression"].any() else 0)
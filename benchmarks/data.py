@@ -0,0 +1,43 @@
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+from typing import Union
+import numpy as np
+import pandas as pd
+
+# Named sizes in days of 1m bars, from one month up to ten years.
+SIZES = {
+	"1M": 30,
+	"3M": 91,
+	"1Y": 365,
+	"3Y": 1095,
+	"10Y": 3650
+}
+
+def get_days(size: Union[str, int]) -> int:
+	if isinstance(size, str):
+		if size not in SIZES:
+			raise Exception(f"Unknown size '{size}', expected one of {list(SIZES.keys())}")
+
+		return SIZES[size]
+
+	return int(size)
+
+def generate_ohlcv(size: Union[str, int] = "1M", seed: int = 0, start: str = "2020-01-01", price: float = 30000.0, volatility: float = 0.0008) -> pd.DataFrame:
+	length = get_days(size) * 1440
+	rng = np.random.default_rng(seed)
+
+	# A geometric random walk with a slow regime term, so trend and mean-reverting strategies both find trades.
+	drift = np.sin(np.arange(length) * (2 * np.pi / (1440 * 45))) * volatility * 0.05
+	close = price * np.exp(np.cumsum(rng.normal(0.0, volatility, length) + drift))
+	open = np.r_[price, close[:-1]]
+	high = np.maximum(open, close) * (1 + np.abs(rng.normal(0.0, volatility * 0.5, length)))
+	low = np.minimum(open, close) * (1 - np.abs(rng.normal(0.0, volatility * 0.5, length)))
+	volume = rng.gamma(2.0, 5.0, length)
+
+	return pd.DataFrame({
+		"datetime": pd.date_range(start, periods=length, freq="1min", tz="UTC", unit="ns"),
+		"open": open,
+		"high": high,
+		"low": low,
+		"close": close,
+		"volume": volume
+	})
@@ -0,0 +1,73 @@
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+import backtester as bt
+
+class TradeHeavy(bt.Strategy):
+	def __init__(self):
+		super().__init__()
+		self.add_indicator(bt.SMA(30))
+
+	def next(self):
+		sma = self.data["sma_30"]
+
+		if self.data["close"] > sma:
+			if not self.has_long:
+				self.open_long(quantity=0.01)
+		elif self.has_long:
+			self.close_long()
+
+class TradeSparse(bt.Strategy):
+	def __init__(self):
+		super().__init__()
+		self.schedule(hours=[0, 23], minutes=[0])
+
+	def next(self):
+		if self.data["datetime"].hour == 0:
+			if not self.has_long:
+				self.open_long(quantity=self.broker.cash * 0.1 / self.data["close"])
+		elif self.has_long:
+			self.close_long()
+
+class LeveragedLongShort(bt.Strategy):
+	def __init__(self):
+		super().__init__()
+		self.add_indicator(bt.EMA(240))
+		self.schedule(timeframe="4h")
+
+	def next(self):
+		close = self.data["close"]
+		ema = self.data["ema_240"]
+
+		if close > ema:
+			if self.has_short:
+				self.close_short()
+
+			if not self.has_long:
+				self.open_long(quantity=0.05)
+				self.set_stop_loss(bt.POSITION_SIDE_LONG, close * 0.98)
+		elif close < ema:
+			if self.has_long:
+				self.close_long()
+
+			if not self.has_short:
+				self.open_short(quantity=0.05)
+				self.set_stop_loss(bt.POSITION_SIDE_SHORT, close * 1.02)
+
+# Each standard strategy with the settings it is benchmarked under.
+STRATEGIES = {
+	"trade_heavy": (TradeHeavy, {"leverage": 1}),
+	"trade_sparse": (TradeSparse, {"leverage": 1}),
+	"leveraged_long_short": (LeveragedLongShort, {"leverage": 5})
+}
+
+def create_strategy(name: str, data) -> bt.Strategy:
+	if name not in STRATEGIES:
+		raise Exception(f"Unknown strategy '{name}'")
+
+	cls, settings = STRATEGIES[name]
+	strategy = cls()
+	strategy.set_fee_rate(0.04)
+	strategy.set_funding_rate(0.01)
+	strategy.set_cash(100000)
+	strategy.set_leverage(settings["leverage"])
+	strategy.set_data(data)
+	return strategy
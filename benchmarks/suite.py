@@ -0,0 +1,115 @@
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+from typing import Callable, Union
+import json
+import platform
+import time
+import numpy as np
+import pandas as pd
+import backtester as bt
+from backtester import utils
+from .data import *
+from .strategies import *
+
+# Metrics read from a Report, so the benchmark covers their first (uncached) computation.
+REPORT_METRICS = [
+	"sharpe_ratio",
+	"daily_return",
+	"cumulative_return",
+	"max_drawdown",
+	"total_fees",
+	"realized_pnl",
+	"turnover",
+	"trades_qty",
+	"win_ratio",
+	"long_ratio",
+	"monthly_returns",
+	"trade_duration"
+]
+
+def measure(fn: Callable, repeat: int = 3, setup: Union[Callable, None] = None) -> float:
+	timings = []
+
+	# The fastest of several runs is the least disturbed by the rest of the machine.
+	for _ in range(repeat):
+		args = (setup(),) if setup is not None else ()
+		start = time.perf_counter()
+		fn(*args)
+		timings.append(time.perf_counter() - start)
+
+	return min(timings)
+
+def _get_report_metrics(report: bt.Report):
+	for name in REPORT_METRICS:
+		getattr(report, name)
+
+def run_suite(size: Union[str, int] = "1M", repeat: int = 3, seed: int = 0, strategies: Union[list[str], None] = None) -> dict:
+	data = generate_ohlcv(size, seed=seed)
+	datetimes = pd.DatetimeIndex(data["datetime"])
+	timestamps = list(data["datetime"].iloc[:100000])
+	results = {}
+
+	for name in strategies if strategies is not None else list(STRATEGIES.keys()):
+		created = {}
+
+		# Every repetition runs a fresh strategy, a reused one would pile up journals, cash and positions.
+		def setup():
+			created["strategy"] = create_strategy(name, data)
+			return created["strategy"]
+
+		results[f"run.{name}"] = measure(lambda x: x.run(), repeat, setup=setup)
+		strategy = created["strategy"]
+
+		def create_report():
+			return bt.Report(strategy=strategy.__class__.__name__, broker=strategy.broker, cfg=strategy.cfg, store=strategy.store)
+
+		results[f"report.{name}"] = measure(create_report, repeat)
+		results[f"report_metrics.{name}"] = measure(lambda: _get_report_metrics(create_report()), repeat)
+
+	results["utils.get_first_min_of_timeframe_mask"] = measure(lambda: utils.get_first_min_of_timeframe_mask(datetimes, "1h"), repeat)
+	results["utils.get_last_min_of_timeframe_mask"] = measure(lambda: utils.get_last_min_of_timeframe_mask(datetimes, "4h"), repeat)
+	results["utils.get_candle_open_timestamps"] = measure(lambda: utils.get_candle_open_timestamps(datetimes, "1D"), repeat)
+	results["utils.is_first_min_of_timeframe"] = measure(lambda: [utils.is_first_min_of_timeframe(x, "1h") for x in timestamps], repeat)
+	results["utils.get_first_cross_index"] = measure(lambda: utils.get_first_cross_index(data["low"].to_numpy(), float(data["low"].min()), True), repeat)
+
+	return {
+		"meta": {
+			"size": size,
+			"bars": len(data.index),
+			"repeat": repeat,
+			"seed": seed,
+			"python": platform.python_version(),
+			"numpy": np.__version__,
+			"pandas": pd.__version__,
+			"machine": platform.machine()
+		},
+		"results": results
+	}
+
+def save_results(results: dict, path: str):
+	with open(path, "w") as f:
+		json.dump(results, f, indent=2)
+
+def load_results(path: str) -> dict:
+	with open(path) as f:
+		return json.load(f)
+
+def compare(results: dict, baseline: dict, tolerance: float = 0.2, min_delta: float = 0.005) -> pd.DataFrame:
+	if results["meta"]["bars"] != baseline["meta"]["bars"]:
+		raise Exception("Results and baseline were measured on different data sizes")
+
+	if results["meta"]["repeat"] != baseline["meta"]["repeat"]:
+		raise Exception("Results and baseline were measured with different repeat counts")
+
+	rows = []
+
+	for name, seconds in results["results"].items():
+		base = baseline["results"].get(name)
+
+		if base is None:
+			continue
+
+		ratio = seconds / base if base > 0 else float("nan")
+		# Sub-millisecond timings jitter by more than any tolerance, so a regression must also cost real time.
+		rows.append([name, base, seconds, ratio, ratio > 1 + tolerance and seconds - base > min_delta])
+
+	return pd.DataFrame(rows, columns=["benchmark", "baseline", "current", "ratio", "regression"])
@@ -25,23 +25,14 @@ for y in years:
 		if exists(file_path):
 			files.append(file_path)
 
-dfs = (pd.read_csv(f, sep=",", header=0, usecols=[0,1,2,3,4,5]) for f in files)
-df_raw = pd.concat(dfs, ignore_index=False)
-df_raw["datetime"] = pd.to_datetime(df_raw["open_time"], unit="ms", utc=True)
-df_raw = df_raw.sort_values("datetime", ascending=True).set_index("datetime")
-df_raw.drop(["open_time"], axis=1, inplace=True)
-
-delta = pd.Timedelta(900, unit="sec")
-
-df = df_raw.resample(delta).agg({
-	"open": "first",
-	"high": "max",
-	"low": "min",
-	"close": "last",
-	"volume": "sum"
-})
-
-df.dropna(inplace=True)
+store = bt.BarStore("/Users/maksimpol/Downloads/Market Data/binance/futures/BTCUSDT/store/1m")
+
+if len(store.months) == 0:
+	store.ingest_csv(files)
+
+df_raw = store.read(columns=["open", "high", "low", "close", "volume"])
+
+df = bt.resampler.resample(df_raw, "15m")
 
 class BuyAndHold24Hours(bt.Strategy):
 	def __init__(self):
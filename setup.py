@@ -19,7 +19,7 @@ setup(
 	license="MIT",
 	classifiers=classifiers,
 	keywords="backtesting",
-	packages=find_packages(),
+	packages=find_packages(exclude=["benchmarks", "benchmarks.*"]),
 	python_requires=">=3.8",
 	install_requires=["numpy", "pandas"]
 )
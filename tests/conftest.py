@@ -0,0 +1,21 @@
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+def make_bars(length: int, start: str = "2021-01-01", seed: int = 1) -> pd.DataFrame:
+	rng = np.random.default_rng(seed)
+	close = 30000 * np.exp(np.cumsum(rng.normal(0, 0.002, length)))
+	open = np.r_[close[0], close[:-1]]
+
+	return pd.DataFrame({
+		"datetime": pd.date_range(start, periods=length, freq="1min", tz="UTC", unit="ns"),
+		"open": open,
+		"high": np.maximum(open, close) * (1 + rng.uniform(0, 0.002, length)),
+		"low": np.minimum(open, close) * (1 - rng.uniform(0, 0.002, length)),
+		"close": close,
+		"volume": rng.uniform(1, 10, length)
+	})
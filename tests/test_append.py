@@ -0,0 +1,58 @@
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+import pandas as pd
+import backtester as bt
+from conftest import make_bars
+
+class Crossing(bt.Strategy):
+	def __init__(self):
+		super().__init__()
+		self.add_indicator(bt.SMA(30))
+		self.add_indicator(bt.RSI(14), streaming=True)
+
+	def next(self):
+		if self.data["close"] > self.data["sma_30"]:
+			if not self.has_long:
+				self.open_long(quantity=0.01)
+		elif self.has_long:
+			self.close_long()
+
+		if not self.has_short and self.data["rsi_14"] > 70:
+			self.open_short(quantity=0.01)
+		elif self.has_short and self.data["rsi_14"] < 50:
+			self.close_short()
+
+def create_strategy(data: pd.DataFrame) -> bt.Strategy:
+	strategy = Crossing()
+	strategy.set_fee_rate(0.04)
+	strategy.set_funding_rate(0.01)
+	strategy.set_leverage(3)
+	strategy.set_cash(10000)
+	strategy.set_equity_curve()
+	strategy.set_equity_curve_timeframe("1h")
+	strategy.set_data(data)
+	return strategy
+
+def test_append_keeps_earlier_report():
+	data = make_bars(20000)
+	strategy = create_strategy(data.iloc[:10030])
+	report = strategy.run()
+	expected = create_strategy(data.iloc[:10030]).run()
+	strategy.append(data.iloc[10030:])
+
+	# Report frames are built lazily from views of the journals, so they're only read after the append.
+	for name in ["trades", "transactions", "portfolio_history", "equity_curve"]:
+		pd.testing.assert_frame_equal(getattr(report, name), getattr(expected, name))
+
+def test_append_matches_full_run():
+	data = make_bars(20000)
+	strategy = create_strategy(data.iloc[:10030])
+	strategy.run()
+	strategy.append(data.iloc[10030:15000])
+	report = strategy.append(data.iloc[15000:])
+	expected = create_strategy(data).run()
+
+	for name in ["trades", "transactions", "portfolio_history", "equity_curve"]:
+		pd.testing.assert_frame_equal(getattr(report, name), getattr(expected, name))
+
+	assert report.benchmark_return == expected.benchmark_return
+	assert report.max_drawdown == expected.max_drawdown
@@ -0,0 +1,38 @@
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+import pandas as pd
+import backtester as bt
+from conftest import make_bars
+
+class HourlyLong(bt.Strategy):
+	def next(self):
+		if self.data["datetime"].minute == 0 and not self.has_long:
+			self.open_long(quantity=0.01)
+		elif self.data["datetime"].minute == 30 and self.has_long:
+			self.close_long()
+
+def write_csv(data: pd.DataFrame, path) -> str:
+	data = data.copy()
+	data["open_time"] = data.pop("datetime").astype("int64") // 10 ** 6
+	data[["open_time", "open", "high", "low", "close", "volume"]].to_csv(path, index=False)
+	return str(path)
+
+def create_strategy(data) -> bt.Strategy:
+	strategy = HourlyLong()
+	strategy.set_fee_rate(0.04)
+	strategy.set_cash(10000)
+	strategy.set_data(data)
+	return strategy
+
+def test_iter_csv_yields_nanosecond_datetimes(tmp_path):
+	files = [write_csv(make_bars(100), tmp_path / "a.csv")]
+	chunk = next(bt.iter_csv(files))
+	assert chunk.index.dtype == pd.DatetimeTZDtype("ns", "UTC")
+
+def test_run_from_csv_matches_frame(tmp_path):
+	data = make_bars(3000)
+	files = [write_csv(data.iloc[:1000], tmp_path / "a.csv"), write_csv(data.iloc[1000:], tmp_path / "b.csv")]
+	streamed = create_strategy(bt.iter_csv(files)).run()
+	expected = create_strategy(data).run()
+	assert len(expected.trades) > 0
+	pd.testing.assert_frame_equal(streamed.trades, expected.trades)
+	pd.testing.assert_frame_equal(streamed.transactions, expected.transactions)
@@ -0,0 +1,78 @@
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+import os
+import pandas as pd
+import pytest
+import backtester as bt
+from conftest import make_bars
+
+class Crash(Exception):
+	pass
+
+class Trader(bt.Strategy):
+	crash_at = None
+
+	def __init__(self):
+		super().__init__()
+		self.add_indicator(bt.RSI(14), streaming=True)
+		self.add_indicator(bt.EMA(50))
+		self.calls = 0
+
+	def next(self):
+		if self.crash_at is not None and self.data["datetime"] >= self.crash_at:
+			raise Crash()
+
+		self.calls += 1
+		rsi = self.data["rsi_14"]
+
+		if not self.has_long and rsi < 30:
+			self.open_long(quantity=0.05)
+			self.set_stop_loss(bt.POSITION_SIDE_LONG, self.data["close"] * 0.995)
+		elif self.has_long and rsi > 65:
+			self.close_long()
+
+		if not self.has_short and rsi > 75:
+			self.open_short(quantity=0.05)
+		elif self.has_short and rsi < 40:
+			self.close_short()
+
+class CrashingTrader(Trader):
+	pass
+
+def get_chunks(data: pd.DataFrame, size: int):
+	for i in range(0, len(data.index), size):
+		yield data.iloc[i:i + size]
+
+def create_strategy(strategy: bt.Strategy, data: pd.DataFrame, path: str, chunked: bool) -> bt.Strategy:
+	strategy.set_fee_rate(0.04)
+	strategy.set_funding_rate(0.01)
+	strategy.set_leverage(3)
+	strategy.set_cash(10000)
+	strategy.set_equity_curve()
+	strategy.set_equity_curve_timeframe("1h")
+	strategy.set_checkpoint(path, every=1000)
+	strategy.set_data(get_chunks(data, 3000) if chunked else data)
+	return strategy
+
+@pytest.mark.parametrize("chunked", [False, True])
+def test_resume_matches_uninterrupted_run(tmp_path, chunked):
+	data = make_bars(10000)
+	strategy = create_strategy(Trader(), data, str(tmp_path / "expected.ckpt"), chunked)
+	expected = strategy.run()
+	assert len(expected.trades.index) > 0
+
+	# The run dies mid-way and a new process resumes from the last checkpoint.
+	CrashingTrader.crash_at = data["datetime"].iloc[6543]
+	path = str(tmp_path / "run.ckpt")
+
+	with pytest.raises(Crash):
+		create_strategy(CrashingTrader(), data, path, chunked).run()
+
+	assert os.path.exists(path)
+	resumed = create_strategy(Trader(), data, path, chunked)
+	report = resumed.resume()
+	assert resumed.calls == strategy.calls
+
+	for name in ["trades", "transactions", "portfolio_history", "equity_curve"]:
+		pd.testing.assert_frame_equal(getattr(report, name), getattr(expected, name))
+
+	assert resumed.broker.cash == strategy.broker.cash
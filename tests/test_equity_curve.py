@@ -0,0 +1,38 @@
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+import pytest
+import backtester as bt
+from conftest import make_bars
+
+class HourlyLong(bt.Strategy):
+	def next(self):
+		if self.data["datetime"].minute == 0 and not self.has_long:
+			self.open_long(quantity=0.5)
+		elif self.data["datetime"].minute == 45 and self.has_long:
+			self.close_long()
+
+def create_strategy(timeframe, metrics_only: bool = False) -> bt.Strategy:
+	strategy = HourlyLong()
+	strategy.set_fee_rate(0.04)
+	strategy.set_leverage(3)
+	strategy.set_cash(10000)
+	strategy.set_equity_curve()
+	strategy.set_equity_curve_timeframe(timeframe)
+	strategy.set_metrics_only(metrics_only)
+	strategy.set_data(make_bars(5000))
+	return strategy
+
+@pytest.mark.parametrize("timeframe", ["5m", "1h", "1D"])
+@pytest.mark.parametrize("metrics_only", [False, True])
+def test_downsampled_max_drawdown_is_exact(timeframe, metrics_only):
+	expected = create_strategy(None).run()
+	report = create_strategy(timeframe, metrics_only).run()
+	assert expected.max_drawdown_pct < 0
+	assert report.max_drawdown_pct == expected.max_drawdown_pct
+	assert report.max_drawdown == expected.max_drawdown
+
+def test_downsampled_drawdowns_take_peaks_from_highs():
+	expected = create_strategy(None).run()
+	report = create_strategy("1h").run()
+	history = report.drawdown_history
+	assert (report.equity_curve["high"] >= report.equity_curve["low"]).all()
+	assert history["drawdown_pct"].min() <= expected.max_drawdown_pct
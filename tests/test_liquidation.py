@@ -0,0 +1,44 @@
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+import pandas as pd
+import pytest
+import backtester as bt
+from conftest import make_bars
+
+class HoldLong(bt.Strategy):
+	def __init__(self):
+		super().__init__()
+		self.opened = False
+
+	def next(self):
+		if not self.opened:
+			self.open_long(quantity=0.1)
+			self.opened = True
+
+def create_strategy(strategy: bt.Backtester, data: pd.DataFrame) -> bt.Backtester:
+	strategy.set_fee_rate(0.04)
+	strategy.set_leverage(10)
+	strategy.set_cash(1000)
+	strategy.set_data(data)
+	return strategy
+
+@pytest.mark.parametrize("cls", [HoldLong, bt.SignalStrategy])
+def test_gap_loss_is_capped_at_margin(cls):
+	data = make_bars(200)
+
+	# The bar gaps 30% below the open price, far past the 10x liquidation price.
+	data.loc[100:, ["open", "high", "low", "close"]] *= 0.7
+
+	strategy = create_strategy(cls(), data)
+	entries = pd.Series(False, index=data.index)
+	entries.iloc[0] = True
+	report = strategy.run() if cls is HoldLong else strategy.run(long_entries=entries, size=0.1)
+	entry, liquidation = report.trades.iloc[0], report.trades.iloc[1]
+	margin = entry["notional"] / 10
+	fees = report.transactions.loc[report.transactions["type"] == bt.TRANSACTION_TYPE_LIQUIDATION_FEE, "amount"]
+
+	assert len(report.trades) == 2
+	assert liquidation["datetime"] == data["datetime"].iloc[100]
+	assert liquidation["price"] == round(data["open"].iloc[100], 2)
+	assert liquidation["realized_pnl"] == pytest.approx(-margin, abs=0.01)
+	assert fees.tolist() == [0]
+	assert strategy.broker.cash == pytest.approx(1000 - margin - entry["fee"], abs=0.01)
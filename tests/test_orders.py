@@ -0,0 +1,96 @@
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+import pandas as pd
+import pytest
+import backtester as bt
+from conftest import make_bars
+
+class Bracket(bt.Strategy):
+	wait = False
+
+	def next(self):
+		close = self.data["close"]
+
+		if not self.has_long:
+			self.open_long(0.01)
+			self.set_stop_loss(bt.POSITION_SIDE_LONG, close * 0.995)
+			self.set_take_profit(bt.POSITION_SIDE_LONG, close * 1.004)
+
+		if not self.has_short and len(self.orders) == 0:
+			self.open_short_limit(0.01, close * 1.003)
+
+		if self.has_short and self.short.stop_loss is None:
+			self.set_stop_loss(bt.POSITION_SIDE_SHORT, self.short.price * 1.004)
+			self.set_take_profit(bt.POSITION_SIDE_SHORT, self.short.price * 0.996)
+
+		if self.wait:
+			self.wait_for_orders()
+
+class WaitingBracket(Bracket):
+	wait = True
+
+class EmulatedBracket(bt.Strategy):
+	# The same orders checked against high/low in next() on every bar, filling at the open when a bar gaps through.
+	def __init__(self):
+		super().__init__()
+		self.limit = None
+		self.stop_loss = {}
+		self.take_profit = {}
+
+	def next(self):
+		low, high, open = self.data["low"], self.data["high"], self.data["open"]
+
+		if self.has_long and low <= self.stop_loss["long"]:
+			self.close_long(price=min(self.stop_loss["long"], open))
+
+		if self.has_short and high >= self.stop_loss["short"]:
+			self.close_short(price=max(self.stop_loss["short"], open))
+
+		if self.has_long and high >= self.take_profit["long"]:
+			self.close_long(price=max(self.take_profit["long"], open))
+
+		if self.has_short and low <= self.take_profit["short"]:
+			self.close_short(price=min(self.take_profit["short"], open))
+
+		if self.limit is not None and high >= self.limit:
+			self.open_short(0.01, price=max(self.limit, open))
+			self.limit = None
+			self.stop_loss["short"] = None
+
+		close = self.data["close"]
+
+		if not self.has_long:
+			self.open_long(0.01)
+			self.stop_loss["long"] = close * 0.995
+			self.take_profit["long"] = close * 1.004
+
+		if not self.has_short and self.limit is None:
+			self.limit = close * 1.003
+
+		if self.has_short and self.stop_loss.get("short") is None:
+			self.stop_loss["short"] = self.short.price * 1.004
+			self.take_profit["short"] = self.short.price * 0.996
+
+def create_strategy(strategy: bt.Strategy, data: pd.DataFrame) -> bt.Strategy:
+	strategy.set_fee_rate(0.04)
+	strategy.set_funding_rate(0.01)
+	strategy.set_leverage(3)
+	strategy.set_cash(10000)
+	strategy.set_equity_curve()
+	strategy.set_data(data)
+	return strategy
+
+@pytest.mark.parametrize("cls", [Bracket, WaitingBracket])
+def test_orders_match_per_bar_emulation(cls):
+	data = make_bars(20000)
+
+	# One bar gaps down through the resting long stop, which then fills at its open.
+	data.loc[7000:, ["open", "high", "low", "close"]] *= 0.99
+
+	report = create_strategy(cls(), data).run()
+	expected = create_strategy(EmulatedBracket(), data).run()
+	gap = report.trades.loc[report.trades["datetime"] == data["datetime"].iloc[7000]].iloc[0]
+	assert gap["side"] == bt.ORDER_SIDE_SELL
+	assert gap["price"] == round(data["open"].iloc[7000], 2)
+
+	for name in ["trades", "transactions", "portfolio_history", "equity_curve"]:
+		pd.testing.assert_frame_equal(getattr(report, name), getattr(expected, name))
@@ -0,0 +1,33 @@
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+import pytest
+import backtester as bt
+from conftest import make_bars
+
+class HoldLong(bt.PortfolioStrategy):
+	def next(self):
+		if self.data.index == 0:
+			self.open_long("A", quantity=0.01)
+
+def create_strategy(feeds: dict) -> bt.PortfolioStrategy:
+	strategy = HoldLong()
+	strategy.set_fee_rate(0.04)
+	strategy.set_leverage(5)
+	strategy.set_cash(10000)
+	strategy.set_data(bt.Panel(feeds, fill=False))
+	return strategy
+
+def test_gap_does_not_liquidate():
+	a = make_bars(100, seed=1)
+	b = make_bars(100, seed=2)
+	report = create_strategy({"A": a.drop(index=range(50, 60)), "B": b}).run()
+	assert len(report.trades) == 1
+	assert not (report.transactions["type"] == bt.TRANSACTION_TYPE_LIQUIDATION_FEE).any()
+
+def test_liquidation_after_gap():
+	a = make_bars(100, seed=1)
+	a.loc[70:, ["open", "high", "low", "close"]] *= 0.5
+	report = create_strategy({"A": a.drop(index=range(50, 60)), "B": make_bars(100, seed=2)}).run()
+	liquidation = report.trades.iloc[1]
+	assert liquidation["datetime"] == a["datetime"].iloc[70]
+	assert liquidation["price"] == pytest.approx(a["open"].iloc[70], abs=0.01)
+	assert liquidation["realized_pnl"] >= -(a["close"].iloc[0] * 0.01 / 5)
@@ -0,0 +1,14 @@
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+import pandas as pd
+import backtester as bt
+from conftest import make_bars
+
+def test_cached_frames_are_not_shared():
+	resampler = bt.Resampler()
+	data = make_bars(600)
+	expected = resampler.resample(data, "1h")
+	modified = resampler.resample(data, "1h")
+	modified["close"] = 0.0
+	modified["signal"] = 1
+	pd.testing.assert_frame_equal(resampler.resample(data, "1h"), expected)
+	assert resampler.resample(data, "1h") is not resampler.resample(data, "1h")
@@ -0,0 +1,46 @@
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+import pandas as pd
+import pytest
+import backtester as bt
+from conftest import make_bars
+
+class Daily(bt.Strategy):
+	def next(self):
+		hour = self.data["datetime"].hour
+
+		if hour == 0 and self.data["datetime"].minute == 0:
+			self.open_long(quantity=0.01)
+			self.open_short(quantity=0.02)
+		elif hour == 23 and self.data["datetime"].minute == 0:
+			if self.has_long:
+				self.close_long()
+
+			if self.has_short:
+				self.close_short()
+
+class ScheduledDaily(Daily):
+	def __init__(self, schedule: dict):
+		super().__init__()
+		self.schedule(**schedule)
+
+def create_strategy(strategy: bt.Strategy, data: pd.DataFrame) -> bt.Strategy:
+	strategy.set_fee_rate(0.04)
+	strategy.set_funding_rate(0.01)
+	strategy.set_leverage(3)
+	strategy.set_cash(10000)
+	strategy.set_equity_curve()
+	strategy.set_data(data)
+	return strategy
+
+@pytest.mark.parametrize("schedule", [{"hours": [0, 23], "minutes": [0]}, {"timeframe": "1h"}, {"column": "signal"}])
+def test_scheduled_run_matches_every_bar(schedule):
+	data = make_bars(6 * 1440)
+	data["signal"] = data["datetime"].dt.minute == 0
+
+	# Funding is charged at 0, 8 and 16h and snapshots at midnight, all on bars the schedule skips or fires on.
+	expected = create_strategy(Daily(), data).run()
+	report = create_strategy(ScheduledDaily(schedule), data).run()
+	assert (report.transactions["type"] == bt.TRANSACTION_TYPE_FUNDING_FEE).sum() > 0
+
+	for name in ["trades", "transactions", "portfolio_history", "equity_curve"]:
+		pd.testing.assert_frame_equal(getattr(report, name), getattr(expected, name))
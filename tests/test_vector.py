@@ -0,0 +1,59 @@
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+import numpy as np
+import pandas as pd
+import pytest
+import backtester as bt
+from conftest import make_bars
+
+class Hourly(bt.Strategy):
+	def next(self):
+		minute = self.data["datetime"].minute
+
+		if minute == 50 and self.has_long:
+			self.close_long()
+
+		if minute == 20 and self.has_short:
+			self.close_short()
+
+		if minute in (0, 10, 50):
+			self.open_long(quantity=0.02)
+
+		if minute in (5, 20):
+			self.open_short(quantity=0.02)
+
+class HourlySignals(bt.SignalStrategy):
+	def signals(self) -> dict:
+		minute = self.store.data["datetime"].dt.minute.to_numpy()
+
+		return {
+			"long_entries": np.isin(minute, [0, 10, 50]),
+			"long_exits": minute == 50,
+			"short_entries": np.isin(minute, [5, 20]),
+			"short_exits": minute == 20,
+			"size": 0.02
+		}
+
+def create_strategy(strategy: bt.Backtester, data: pd.DataFrame, leverage: int) -> bt.Backtester:
+	strategy.set_fee_rate(0.04)
+	strategy.set_funding_rate(0.01)
+	strategy.set_leverage(leverage)
+	strategy.set_cash(10000)
+	strategy.set_equity_curve()
+	strategy.set_data(data)
+	return strategy
+
+@pytest.mark.parametrize("leverage", [1, 5, 25])
+def test_liquidations_match_strategy(leverage):
+	data = make_bars(20000)
+
+	# Gaps down and up, so positions of both sides get liquidated, some at the open of the gap bar.
+	data.loc[6000:, ["open", "high", "low", "close"]] *= 0.8
+	data.loc[12000:, ["open", "high", "low", "close"]] *= 1.5
+
+	expected = create_strategy(Hourly(), data, leverage).run()
+	report = create_strategy(HourlySignals(), data, leverage).run()
+	liquidations = (expected.transactions["type"] == bt.TRANSACTION_TYPE_LIQUIDATION_FEE).sum()
+	assert (liquidations > 0) == (leverage > 1)
+
+	for name in ["trades", "transactions", "portfolio_history", "equity_curve"]:
+		pd.testing.assert_frame_equal(getattr(report, name), getattr(expected, name))
@@ -0,0 +1,28 @@
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+import pytest
+import backtester as bt
+from conftest import make_bars
+
+class HourlyLong(bt.Strategy):
+	entry_minute = 0
+	failing = False
+
+	def next(self):
+		if self.failing:
+			raise Exception("Failed")
+
+		if self.data["datetime"].minute == self.entry_minute and not self.has_long:
+			self.open_long(quantity=0.01)
+		elif self.data["datetime"].minute == 45 and self.has_long:
+			self.close_long()
+
+@pytest.mark.parametrize("failing", [False, True])
+def test_progress_rises_to_one_total(failing):
+	calls = []
+	grid = {"entry_minute": [0, 15, 30], "failing": [failing]}
+	report = bt.walk_forward(HourlyLong, grid, make_bars(4 * 1440), train="1D", test="12h", settings={"cash": 10000}, processes=1, progress=lambda done, total: calls.append((done, total)))
+	total = len(report.windows.index) * 4
+
+	assert all(t == total for _, t in calls)
+	assert [d for d, _ in calls] == sorted(set(d for d, _ in calls))
+	assert calls[-1] == (total, total)